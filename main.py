@@ -1,11 +1,17 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from modules.supabase_auth import router as auth_supabase_router
 from modules.estimate import router as estimate_router
 from modules.dashboard import router as dashboard_router
+from modules.supabase_client import async_supabase
+from modules.browser_pool import browser_pool
 import sys
 import asyncio
 import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
@@ -13,6 +19,8 @@ if sys.platform == 'win32':
 app = FastAPI(
     title="GetQuote Extension Auth API",
     version="1.0.0",
+    # Scrape results carry long per-project detail lists; orjson serialises them several times faster.
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -23,6 +31,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def warm_up_supabase():
+    try:
+        await async_supabase.warm_up()
+    except Exception as e:
+        logger.warning(f"Supabase warm-up failed: {e}")
+
+@app.on_event("startup")
+async def start_browser_pool():
+    # Launch Chromium now so the first scrape only has to open a context.
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.warning(f"Browser pool warm-up failed: {e}")
+
+@app.on_event("shutdown")
+async def close_browser_pool():
+    await browser_pool.close()
+
 # Setup routes
 app.include_router(auth_supabase_router, prefix="/supabase", tags=["Auth-Supabase"])
 app.include_router(estimate_router, prefix="/scrapper", tags=["scrapper"])
@@ -0,0 +1,15 @@
+-- Conflict target for the scrapers' upsert(..., on_conflict="project_id,url").
+-- Without it PostgREST rejects every tenders upsert with 42P10.
+
+-- A unique index cannot be built over existing duplicates: keep one row per (project_id, url).
+DELETE FROM public.tenders a
+USING public.tenders b
+WHERE a.project_id = b.project_id
+  AND a.url = b.url
+  AND a.ctid < b.ctid;
+
+CREATE UNIQUE INDEX IF NOT EXISTS tenders_project_id_url_key
+    ON public.tenders (project_id, url);
+
+-- Let PostgREST see the new index without a restart.
+NOTIFY pgrst, 'reload schema';
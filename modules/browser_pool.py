@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import re
+from playwright.async_api import async_playwright
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_HOSTS = frozenset({"google-analytics.com", "facebook.com", "twitter.com", "linkedin.com", "doubleclick.net"})
+# Narrow context routes: only URLs matching one of these reach Playwright's router, so
+# first-party documents and XHRs load natively with no Python callback. Kept JS-compatible
+# because Playwright evaluates the patterns in the driver.
+_HOST = r"^[a-z]+://(?:[^/?#]*\.)?(?:%s)(?::\d+)?(?:[/?#]|$)"
+BLOCKED_ASSET_RE = re.compile(r"\.(?:png|jpe?g|gif|webp|svg|ico|css|woff2?|ttf|otf|mp4|webm|ogg)(?:[?#]|$)", re.IGNORECASE)
+BLOCKED_HOSTS_RE = re.compile(_HOST % "|".join(map(re.escape, sorted(BLOCKED_HOSTS))), re.IGNORECASE)
+THIRD_PARTY_RE = re.compile(r"^[a-z]+://(?!(?:[^/?#]*\.)?estimateone\.com(?::\d+)?(?:[/?#]|$))", re.IGNORECASE)
+_BLOCKED_EXTENSIONS = ("png", "jpg", "jpeg", "gif", "svg", "webp", "ico", "css", "woff", "woff2", "ttf", "otf", "mp4", "webm", "ogg")
+# Same blocklist as Chromium URL patterns; filtered in the renderer so the bulk of asset
+# requests never reach the router at all. '*' is the only wildcard, so each pattern is
+# anchored to the end of the path (or the query) and to the host, never a bare substring.
+BLOCKED_URL_PATTERNS = (
+    *(pattern for ext in _BLOCKED_EXTENSIONS for pattern in (f"*.{ext}", f"*.{ext}?*")),
+    *(pattern for host in sorted(BLOCKED_HOSTS) for pattern in (f"*://{host}/*", f"*://*.{host}/*")),
+)
+
+async def _abort(route, request):
+    await route.abort()
+
+class BrowserPool:
+    """Long-lived Chromium shared by every scrape; callers check browser contexts out and back in."""
+
+    LAUNCH_ARGS = [
+        '--no-sandbox','--disable-dev-shm-usage','--disable-gpu','--disable-extensions','--disable-plugins',
+        '--memory-pressure-off','--max_old_space_size=2048',
+        '--disable-background-timer-throttling','--disable-backgrounding-occluded-windows','--disable-renderer-backgrounding',
+        '--disable-features=TranslateUI','--disable-ipc-flooding-protection'
+    ]
+
+    def __init__(self, recycle_after: int = 200):
+        self.recycle_after = recycle_after
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+        self._contexts_served = 0
+        self._open_contexts = 0
+
+    async def _ensure_browser(self):
+        # Callers hold self._lock.
+        if self._browser is None or not self._browser.is_connected():
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True, args=self.LAUNCH_ARGS)
+            self._contexts_served = 0
+        return self._browser
+
+    async def start(self):
+        """Launch Chromium ahead of the first scrape."""
+        async with self._lock:
+            await self._ensure_browser()
+
+    async def _acquire_browser(self):
+        async with self._lock:
+            if self._browser is not None and self._contexts_served >= self.recycle_after and not self._open_contexts:
+                # Relaunch once idle after many contexts so a long-running process sheds Chromium's leaks.
+                await self._browser.close()
+                self._browser = None
+            browser = await self._ensure_browser()
+            self._contexts_served += 1
+            self._open_contexts += 1
+            return browser
+
+    async def checkout(self, scraper, storage_state=None, **options):
+        """New context preloaded with the account's saved login and the scraper's request blocking.
+
+        ``scraper`` is either scraper class: anything with get_cached_session() and a
+        block_resources_aggressive(route, request, context) handler for third-party requests.
+        """
+        browser = await self._acquire_browser()
+        context = None
+        try:
+            context = await browser.new_context(storage_state=storage_state or scraper.get_cached_session(), **options)
+            # Playwright tries the most recently added route first, so assets and trackers
+            # are aborted before the third-party handler can let them through during login.
+            await context.route(
+                THIRD_PARTY_RE, lambda route, request: scraper.block_resources_aggressive(route, request, context)
+            )
+            await context.route(BLOCKED_HOSTS_RE, _abort)
+            await context.route(BLOCKED_ASSET_RE, _abort)
+        except Exception:
+            # Close a context that was created but not fully set up before releasing its slot,
+            # so a recycle never closes the browser under a live context.
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.debug(f"Context close error (continuing): {e}")
+            self._open_contexts -= 1
+            raise
+        return context
+
+    async def new_page(self, context):
+        """Open a page whose obvious asset and tracker requests Chromium refuses before the route handler sees them."""
+        page = await context.new_page()
+        try:
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+            # Network.enable can leave the HTTP cache bypassed; keep it on so first-party scripts are reused.
+            await cdp.send("Network.setCacheDisabled", {"cacheDisabled": False})
+        except Exception as e:
+            logger.debug(f"CDP request blocking unavailable, relying on route handler: {e}")
+        return page
+
+    async def checkin(self, context):
+        self._open_contexts -= 1
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Context close error (continuing): {e}")
+
+    async def close(self):
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+browser_pool = BrowserPool()
@@ -1,33 +1,12 @@
 from __future__ import annotations
 
-import asyncio
 import logging
-import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 
 from fastapi import APIRouter, HTTPException, Header, Query
 from pydantic import BaseModel
-from supabase import create_client, Client
-from supabase.client import ClientOptions
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# Environment variables
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-# Create Supabase client
-supabase: Client = create_client(
-    SUPABASE_URL,
-    SUPABASE_KEY,
-    options=ClientOptions(
-        postgrest_client_timeout=10,
-        storage_client_timeout=10,
-    ),
-)
+from modules.supabase_client import async_supabase, get_user_id
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
@@ -90,10 +69,12 @@ async def authenticate_user(authorization: str) -> str:
     token = authorization.split(" ")[1]
     
     try:
-        user = await asyncio.to_thread(lambda: supabase.auth.get_user(token))
-        if not user.user:
+        user_id = await get_user_id(token)
+        if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return user.user.id
+        return user_id
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Authentication error: {e}")
         raise HTTPException(status_code=401, detail="Authentication failed")
@@ -177,17 +158,17 @@ async def get_dashboard_stats(authorization: str = Header(None)):
         logger.info(f"📊 Fetching dashboard stats for user: {user_id}")
         
         # Get total active projects
-        total_projects_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        total_projects_result = await (
+            async_supabase.table("tenders")
             .select("project_id", count="exact")
             .execute()
         )
         total_projects = len(total_projects_result.data) if total_projects_result.data else 0
         
         # Get projects from this week
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        this_week_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+        this_week_result = await (
+            async_supabase.table("tenders")
             .select("project_id")
             .gte("scraped_at", week_ago)
             .execute()
@@ -195,8 +176,8 @@ async def get_dashboard_stats(authorization: str = Header(None)):
         this_week_projects = len(this_week_result.data) if this_week_result.data else 0
         
         # Get unique builders (subcontractors)
-        builders_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        builders_result = await (
+            async_supabase.table("tenders")
             .select("builder")
             .not_.is_("builder", "null")
             .neq("builder", "")
@@ -205,8 +186,8 @@ async def get_dashboard_stats(authorization: str = Header(None)):
         unique_builders = len(set(item["builder"] for item in builders_result.data if item.get("builder")))
         
         # Get average trades per project
-        trades_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        trades_result = await (
+            async_supabase.table("tenders")
             .select("number_of_trades")
             .not_.is_("number_of_trades", "null")
             .execute()
@@ -219,8 +200,8 @@ async def get_dashboard_stats(authorization: str = Header(None)):
             avg_trades = 0
         
         # Calculate total budget value
-        budget_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        budget_result = await (
+            async_supabase.table("tenders")
             .select("max_budget, overall_budget")
             .execute()
         )
@@ -274,7 +255,7 @@ async def get_dashboard_projects(
         logger.info(f"📋 Fetching dashboard projects for user: {user_id} (limit: {limit})")
         
         # Build query using the same format as your Supabase query
-        query = supabase.table("tenders").select(
+        query = async_supabase.table("tenders").select(
             "project_name, project_id, project_address, max_budget, category, "
             "number_of_trades, project_due_date, builder, overall_budget, scraped_at"
         ).not_.is_("project_name", "null")
@@ -289,8 +270,8 @@ async def get_dashboard_projects(
             query = query.eq("category", category)
         
         # Execute query with your exact format
-        projects_result = await asyncio.to_thread(
-            lambda: query.order("scraped_at", desc=True).limit(limit).execute()
+        projects_result = await (
+            query.order("scraped_at", desc=True).limit(limit).execute()
         )
         
         projects = []
@@ -324,7 +305,7 @@ async def get_dashboard_projects(
             projects.append(project_summary)
         
         # Get total count for pagination
-        total_count_query = supabase.table("tenders").select("project_id", count="exact").not_.is_("project_name", "null")
+        total_count_query = async_supabase.table("tenders").select("project_id", count="exact").not_.is_("project_name", "null")
         
         # Apply same filters for count
         if project_id:
@@ -332,7 +313,7 @@ async def get_dashboard_projects(
         if category:
             total_count_query = total_count_query.eq("category", category)
         
-        total_count_result = await asyncio.to_thread(lambda: total_count_query.execute())
+        total_count_result = await total_count_query.execute()
         total_count = len(total_count_result.data) if total_count_result.data else 0
         
         logger.info(f"✅ Retrieved {len(projects)} projects from {total_count} total")
@@ -359,8 +340,8 @@ async def get_project_by_id(
         logger.info(f"🔍 Fetching specific project by ID: {project_id} for user: {user_id}")
         
         # Query for specific project ID
-        projects_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        projects_result = await (
+            async_supabase.table("tenders")
             .select("project_name, project_id, project_address, max_budget, category, "
                    "number_of_trades, project_due_date, builder, overall_budget, scraped_at")
             .eq("project_id", project_id)
@@ -419,8 +400,8 @@ async def get_dashboard_recent_activity(
         logger.info(f"📈 Fetching recent activity for user: {user_id}")
         
         # Get recently scraped projects
-        recent_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        recent_result = await (
+            async_supabase.table("tenders")
             .select("project_name, project_id, scraped_at, category")
             .not_.is_("project_name", "null")
             .order("scraped_at", desc=True)
@@ -456,10 +437,10 @@ async def get_dashboard_trends(authorization: str = Header(None)):
         logger.info(f"📊 Fetching dashboard trends for user: {user_id}")
         
         # Get project trends for last 7 days
-        trends_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        trends_result = await (
+            async_supabase.table("tenders")
             .select("scraped_at, max_budget, overall_budget")
-            .gte("scraped_at", (datetime.now() - timedelta(days=7)).isoformat())
+            .gte("scraped_at", (datetime.now(timezone.utc) - timedelta(days=7)).isoformat())
             .order("scraped_at", desc=False)
             .execute()
         )
@@ -487,8 +468,8 @@ async def get_dashboard_trends(authorization: str = Header(None)):
         ]
         
         # Get category breakdown
-        categories_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        categories_result = await (
+            async_supabase.table("tenders")
             .select("category")
             .not_.is_("category", "null")
             .execute()
@@ -500,8 +481,8 @@ async def get_dashboard_trends(authorization: str = Header(None)):
             category_breakdown[category] = category_breakdown.get(category, 0) + 1
         
         # Get budget ranges breakdown
-        budgets_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        budgets_result = await (
+            async_supabase.table("tenders")
             .select("max_budget, overall_budget")
             .execute()
         )
@@ -540,8 +521,8 @@ async def get_available_categories(authorization: str = Header(None)):
     user_id = await authenticate_user(authorization)
     
     try:
-        categories_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        categories_result = await (
+            async_supabase.table("tenders")
             .select("category")
             .not_.is_("category", "null")
             .neq("category", "")
@@ -565,8 +546,8 @@ async def delete_project(project_id: str, authorization: str = Header(None)):
     try:
         logger.info(f"🗑️ Deleting project {project_id} for user: {user_id}")
         
-        result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        result = await (
+            async_supabase.table("tenders")
             .delete()
             .eq("project_id", project_id)
             .execute()
@@ -595,8 +576,8 @@ async def export_projects(
     try:
         logger.info(f"📤 Exporting projects in {format} format for user: {user_id}")
         
-        projects_result = await asyncio.to_thread(
-            lambda: supabase.table("tenders")
+        projects_result = await (
+            async_supabase.table("tenders")
             .select("*")
             .order("scraped_at", desc=True)
             .execute()
@@ -4,37 +4,49 @@ import logging
 import traceback
 import re
 import os
+import hashlib
+import json
+import secrets
+import stat
+import tempfile
 import time
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
-from typing import List, Dict, Any, Tuple
+import weakref
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import List, Dict, Any, NamedTuple, Tuple
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from playwright.sync_api import sync_playwright, Page
+from playwright.async_api import Page
 from dotenv import load_dotenv
+from cachetools import TTLCache
 from cryptography.fernet import Fernet
-from supabase import create_client, Client
-from supabase.client import ClientOptions
+from modules.supabase_client import async_supabase, get_user_id
+from modules.browser_pool import browser_pool
 
 load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
 
-supabase: Client = create_client(
-    SUPABASE_URL,
-    SUPABASE_KEY,
-    options=ClientOptions(
-        postgrest_client_timeout=10,
-        storage_client_timeout=10,
-    ),
-)
-
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 logger = logging.getLogger("EstimateOneService")
 router = APIRouter()
-thread_pool = ThreadPoolExecutor(max_workers=3)
+# Scraping is I/O-bound, so it runs on the event loop with async Playwright instead of
+# in a thread or process pool: routes await the scrape directly, scrape_semaphore caps
+# concurrent jobs and each job uses at most POPUP_WORKERS (listing scrapes) or
+# SEARCH_WORKERS (project ID searches) browser contexts.
+MAX_CONCURRENT_SCRAPES = 3
+POPUP_WORKERS = 3
+SEARCH_WORKERS = 4
+STORAGE_STATE_DIR = Path(tempfile.gettempdir()) / "e1_states"
+EXISTS_CHUNK_SIZE = 500
+MAX_PROJECT_IDS = 500
+scrape_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+# user_id -> (EstimateOne email, decrypted password), kept CREDENTIALS_CACHE_TTL seconds.
+# The only process-wide copy of a decrypted password: entries expire, and are dropped
+# when EstimateOne rejects the login, so a changed password is re-read from Supabase.
+_CREDENTIALS: TTLCache = TTLCache(maxsize=1024, ttl=int(os.getenv("CREDENTIALS_CACHE_TTL", "300")))
+_CREDENTIAL_LOCKS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
 
 class EstimateOneRequest(BaseModel):
     url: str
@@ -49,75 +61,290 @@ class EstimateOneResponse(BaseModel):
     data: dict
     file_path: str | None = None
 
-def decrypt_password(encrypted_password: str) -> str:
-    ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
+@lru_cache(maxsize=1)
+def _get_cipher() -> Fernet:
     if not ENCRYPTION_KEY:
         raise ValueError("ENCRYPTION_KEY not found in environment variables")
-    cipher_suite = Fernet(ENCRYPTION_KEY.encode())
-    decrypted_password = cipher_suite.decrypt(encrypted_password.encode())
+    return Fernet(ENCRYPTION_KEY.encode())
+
+def decrypt_password(encrypted_password: str) -> str:
+    decrypted_password = _get_cipher().decrypt(encrypted_password.encode())
     return decrypted_password.decode()
 
+_BUDGET_SPLIT_RE = re.compile(r'their approximate budget is|approximate budget', re.IGNORECASE)
+_BUDGET_VALUE_RE = re.compile(r'\$[\d,]+(?:\.\d+)?[mk]?\s*-\s*\$[\d,]+(?:\.\d+)?[mk]?|\$[\d,]+(?:\.\d+)?[mk]?')
+_TRADES_RE = re.compile(r'(\d+)\s+trades')
+_DEADLINE_RE = re.compile(r'submitted by\s+(.+?)\.')
+
+class EstimateOneError(Exception):
+    """Scrape failure that maps onto a specific HTTP status and client-facing detail."""
+    status_code = 500
+    detail = "EstimateOne scraping failed. Please try again or contact support."
+
+class EstimateOneLoginError(EstimateOneError):
+    status_code = 401
+    detail = "EstimateOne login failed. Please check your credentials."
+
+class EstimateOneSessionExpired(EstimateOneLoginError):
+    """EstimateOne bounced a logged-in page back to the login form mid-scrape."""
+
+class EstimateOneNotFoundError(EstimateOneError):
+    status_code = 404
+    detail = "EstimateOne page not found. Please check the URL."
+
+class EstimateOneForbiddenError(EstimateOneError):
+    status_code = 403
+    detail = "Access denied to EstimateOne page. Check your account permissions."
+
+def owned_state_dir() -> Path | None:
+    """STORAGE_STATE_DIR, created owner-only; None if it exists but is not a directory we own.
+
+    It lives under the shared tempdir, so another local user could have created it first;
+    saved logins are then neither written nor loaded.
+    """
+    try:
+        STORAGE_STATE_DIR.mkdir(mode=0o700, exist_ok=True)
+        st = os.lstat(STORAGE_STATE_DIR)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+            logger.warning(f"{STORAGE_STATE_DIR} is not a directory owned by this user; not caching logins")
+            return None
+        if stat.S_IMODE(st.st_mode) != 0o700:
+            os.chmod(STORAGE_STATE_DIR, 0o700)
+        return STORAGE_STATE_DIR
+    except OSError as e:
+        logger.warning(f"Login state directory unavailable: {e}")
+        return None
+
+def write_private_file(path: Path, text: str) -> None:
+    """Atomically replace ``path`` with a file that is 0600 from the moment it is created."""
+    tmp_path = path.with_suffix(f".{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+_conflict_target_reported = False
+
+def is_missing_conflict_target(exc: Exception) -> bool:
+    """True for PostgREST's 42P10: tenders has no unique index matching on_conflict.
+
+    Every upsert fails the same way until the index exists, so the fix is logged once and
+    callers give up on the batch instead of retrying it row by row.
+    """
+    global _conflict_target_reported
+    if getattr(exc, "code", None) != "42P10":
+        return False
+    if not _conflict_target_reported:
+        _conflict_target_reported = True
+        logger.error(
+            "tenders has no unique index on (project_id, url), so nothing can be saved; "
+            "apply migrations/001_tenders_project_id_url_unique.sql to the database"
+        )
+    return True
+
+def _raise_for_status(response) -> None:
+    """Raise the matching EstimateOneError when EstimateOne answers a navigation with 403 or 404."""
+    if response is None:
+        return
+    if response.status == 404:
+        raise EstimateOneNotFoundError(f"{response.url} returned 404")
+    if response.status == 403:
+        raise EstimateOneForbiddenError(f"{response.url} returned 403")
+
+# Columns copied verbatim from the scraped record; url, scraped_at, has_documents and
+# number_of_trades need conversion and are set in _to_tender_row.
+_TENDER_COLUMNS = (
+    "project_name", "project_id", "project_address", "max_budget", "distance", "category",
+    "builder", "quote_due_builder", "project_due_date", "interest_level",
+    "submission_deadline", "overall_budget", "builder_descriptions", "row_number",
+)
+_TENDER_KEYS = (
+    "Project Name", "Project ID", "Project Address", "Max Budget", "Distance", "Category",
+    "Builder", "Quote Due (Builder)", "Project Due Date", "Interest Level",
+    "Submission Deadline", "Overall Budget", "Builder Descriptions", "Row Number",
+)
+
 class EstimateOneAPIScraper:
-    def __init__(self, email=None, password=None):
+    SELECTORS = {
+        "row": "tbody.styles__tenderRow__b2e48989c7e9117bd552",
+        "name": ".styles__projectLink__bb24735487bba39065d8",
+        "id": ".styles__projectId__a99146050623e131a1bf",
+        "address": ".styles__projectAddress__e13a9deabdbf43356939",
+        "budget": ".styles__budgetRange__b101ae22d71fd54397d0",
+        "category": ".styles__lowPriority__ca01365a4bba34b27c8a span",
+        "builder": ".styles__builderName__f71d1b6dc7d0969616ea",
+        "quote_date": ".styles__quoteDate__b21c670d4b980f23ba7c .styles__projectDate__efdf1ddef6a4526d58ac",
+        "project_date": ".styles__projectDate__efdf1ddef6a4526d58ac",
+        "no_docs": ".styles__noDocsTag__d3dc744a652a94be3eea",
+        "interest": ".reactSelect__single-value",
+        "autocomplete": ".styles__autocomplete__d2da89763ad53db5dcf7",
+        "details": "#project-details, .styles__projectSection__f1b9aeb71ec0b48e56e0, .ReactModal__Content",
+        "stage_description": ".styles__stageDescription__a6f572d1edbede52b379",
+        "read_more_toggle": "a.styles__hideShow__e8f2d705067479d13623",
+        "read_more": "a.styles__hideShow__e8f2d705067479d13623, a[href='#project-details'], .styles__hideShowWrapper__cf01bc021f03d3785134 a",
+    }
+    # Whole-row and whole-popup reads done in one evaluate() each instead of a
+    # query_selector/inner_text round-trip per field; missing elements come back as null.
+    ROW_JS = """(el, sel) => {
+        const text = s => el.querySelector(s)?.innerText.trim() ?? null;
+        const dates = el.querySelectorAll(sel.project_date);
+        return {
+            "Project Name": text(sel.name),
+            "Project ID": text(sel.id),
+            "Project Address": text(sel.address),
+            "Max Budget": text(sel.budget),
+            "Distance": Array.from(el.querySelectorAll('td'), td => td.innerText.trim()).find(t => t.endsWith('km')) || null,
+            "Category": text(sel.category),
+            "Builder": text(sel.builder),
+            "Quote Due (Builder)": text(sel.quote_date),
+            "Project Due Date": dates.length ? dates[dates.length - 1].innerText.trim() : null,
+            "Has Documents": el.querySelector(sel.no_docs) ? "No" : "Yes",
+            "Interest Level": text(sel.interest) ?? "Please Select",
+        };
+    }"""
+    ROW_IDS_JS = "(rows, sel) => rows.map(r => r.querySelector(sel)?.innerText.trim() || null)"
+    FIND_ROW_JS = "(rows, [sel, pid]) => rows.findIndex(r => (r.querySelector(sel)?.innerText || '').includes(pid))"
+    EXPAND_JS = """(section, sel) => {
+        const clicked = new Set();
+        const click = link => { if (link && !clicked.has(link)) { link.click(); clicked.add(link); } };
+        click(section.querySelector(sel.read_more_toggle));
+        for (const item of section.querySelectorAll(sel.stage_description)) {
+            click(item.querySelector(sel.read_more)
+                || Array.from(item.querySelectorAll('a')).find(a => a.innerText.includes('Read more')));
+        }
+        return clicked.size;
+    }"""
+    POPUP_JS = """(section, sel) => {
+        const text = el => el ? el.innerText.trim() : null;
+        const address = [sel.address, "[class*='address']", "[class*='location']"]
+            .map(s => section.querySelector(s)).find(Boolean);
+        return {
+            text: section.innerText.trim(),
+            name: text(section.querySelector("h1, h2, h3, .project-title, [class*='title']")),
+            address: text(address),
+            budget: text(section.querySelector(sel.budget)),
+            descriptions: Array.from(section.querySelectorAll(sel.stage_description), item => ({
+                builder: text(item.querySelector("strong")),
+                text: item.innerText.trim(),
+            })),
+        };
+    }"""
+    # Click, wait for the modal, expand Read more and read it, all inside one evaluate.
+    # Only a details node that was not in the DOM before the click and that names the
+    # project counts, so a previous project's popup that is still closing is never read;
+    # resolves to null if no such modal shows up.
+    OPEN_POPUP_JS = """async (link, [sel, keys]) => {
+        const expand = """ + EXPAND_JS + """;
+        const read = """ + POPUP_JS + """;
+        const waitFor = (test, timeout) => new Promise(resolve => {
+            const hit = test();
+            if (hit) return resolve(hit);
+            const observer = new MutationObserver(() => {
+                const found = test();
+                if (found) { observer.disconnect(); resolve(found); }
+            });
+            observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+            setTimeout(() => { observer.disconnect(); resolve(test()); }, timeout);
+        });
+        const names = [...keys, link.innerText.trim()].filter(Boolean);
+        const stale = new Set(document.querySelectorAll(sel.details));
+        const fresh = () => Array.from(document.querySelectorAll(sel.details)).find(node =>
+            node.isConnected && !stale.has(node) && names.some(name => node.innerText.includes(name))) || null;
+        link.click();
+        const modal = await waitFor(fresh, 3000);
+        if (!modal) return null;
+        if (expand(modal, sel)) {
+            await waitFor(() => !Array.from(modal.querySelectorAll('a'), a => a.innerText).some(t => t.includes('Read more')), 2000);
+        }
+        return read(modal, sel);
+    }"""
+    def __init__(self, email=None, password=None, strict_blocking=True):
         self.email = email
         self.password = password
         self.login_url = "https://app.estimateone.com/auth/login"
-        self.session_cache = {}
+        self.strict_blocking = strict_blocking
+        # Contexts currently logging in, which let third-party requests through.
+        self._relaxed_contexts: set = set()
         self.session_duration = 1800
-        self.scraped_projects = []
+        self._insert_buffer: List[Dict[str, Any]] = []
+        self._insert_batch_size = 500
+        # Full batches are written by one background task so scraping carries on during the upsert.
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer: asyncio.Task | None = None
+        self._written: List[Dict[str, Any]] = []
+        # IDs already classified this session; _known_ids is the subset present in tenders.
+        self._checked_ids: set[str] = set()
+        self._known_ids: set[str] = set()
         logger.info(f"Loading EstimateOne credentials - Email: {'✓' if self.email else '✗'}")
         if not self.email or not self.password:
             raise ValueError("Missing EstimateOne email and password")
 
-    def check_project_exists_early(self, project_id: str) -> bool:
+    @property
+    def storage_state_path(self) -> Path:
+        account = hashlib.sha256(self.email.encode()).hexdigest()[:16]
+        return STORAGE_STATE_DIR / f"estimateone_state_{account}.json"
+
+    def get_cached_session(self) -> str | None:
+        """Saved login state for this account, if it is younger than session_duration."""
+        if owned_state_dir() is None:
+            return None
+        path = self.storage_state_path
         try:
-            if not project_id:
-                return False
-            result = supabase.table("tenders").select("project_id").eq("project_id", project_id).execute()
-            exists = bool(result.data)
-            if exists:
-                logger.info(f"⚠️ DUPLICATE FOUND: Project ID {project_id} already exists in database - SKIPPING")
-                return True
-            else:
-                logger.debug(f"✅ NEW PROJECT: Project ID {project_id} is new - will process")
-                return False
+            if time.time() - path.stat().st_mtime < self.session_duration:
+                return str(path)
+        except FileNotFoundError:
+            pass
+        return None
+
+    async def cache_session(self, context):
+        # The state holds session cookies: owner-only directory and file, written atomically
+        # so a concurrent scrape for the same account never loads a half-written file.
+        if owned_state_dir() is None:
+            return
+        try:
+            state = await context.storage_state()
+            write_private_file(self.storage_state_path, json.dumps(state))
         except Exception as e:
-            logger.error(f"❌ Error in early duplicate check for {project_id}: {e}")
-            return False
+            logger.warning(f"Could not save login state: {e}")
 
-    def filter_duplicate_project_ids(self, project_ids: List[str]) -> Tuple[List[str], List[str]]:
+    async def fetch_existing_project_ids(self, project_ids: List[str]) -> set[str]:
+        existing = {project_id for project_id in project_ids if project_id in self._known_ids}
+        ids = [project_id for project_id in dict.fromkeys(project_ids) if project_id and project_id not in self._checked_ids]
+        # Chunked to keep the in.(...) filter well under PostgREST's URL length limit.
+        for start in range(0, len(ids), EXISTS_CHUNK_SIZE):
+            chunk = ids[start:start + EXISTS_CHUNK_SIZE]
+            result = await async_supabase.table("tenders").select("project_id").in_("project_id", chunk).execute()
+            existing.update(row["project_id"] for row in result.data)
+            self._checked_ids.update(chunk)
+        self._known_ids.update(existing)
+        return existing
+
+    async def filter_duplicate_project_ids(self, project_ids: List[str]) -> Tuple[List[str], List[str]]:
         if not project_ids:
             return [], []
+        try:
+            existing = await self.fetch_existing_project_ids(project_ids)
+        except Exception as e:
+            logger.error(f"❌ Error in bulk duplicate check: {e}")
+            existing = set()
         new_ids, duplicate_ids = [], []
-        for project_id in project_ids:
-            if self.check_project_exists_early(project_id):
-                duplicate_ids.append(project_id)
-            else:
-                new_ids.append(project_id)
+        # dict.fromkeys keeps request order but drops repeated IDs, so each project is scraped once.
+        for project_id in dict.fromkeys(project_ids):
+            (duplicate_ids if project_id in existing else new_ids).append(project_id)
+        if duplicate_ids:
+            logger.info(f"⚠️ {len(duplicate_ids)} project(s) already exist in database - SKIPPING")
         return new_ids, duplicate_ids
 
-    def get_cached_session(self):
-        current_time = time.time()
-        if 'login_time' in self.session_cache:
-            time_elapsed = current_time - self.session_cache['login_time']
-            if time_elapsed < self.session_duration:
-                logger.debug(f"Using cached session ({int(self.session_duration - time_elapsed)}s remaining)")
-                return True
-        return False
-
-    def cache_session(self):
-        self.session_cache['login_time'] = time.time()
-        logger.debug("Login session cached")
-
-    def block_resources_aggressive(self, route, request):
-        blocked_types = ["image", "stylesheet", "font", "media", "websocket", "manifest"]
-        blocked_domains = ["google-analytics", "facebook.com", "twitter.com", "linkedin.com", "doubleclick.net"]
-        if request.resource_type in blocked_types:
-            route.abort()
-        elif any(domain in request.url for domain in blocked_domains):
-            route.abort()
+    async def block_resources_aggressive(self, route, request, context):
+        # browser_pool routes only third-party URLs here; assets and trackers are aborted without a Python callback.
+        if self.strict_blocking and context not in self._relaxed_contexts:
+            await route.abort()
         else:
-            route.continue_()
+            await route.continue_()
 
     def _convert_to_int(self, value):
         if value is None:
@@ -127,42 +354,77 @@ class EstimateOneAPIScraper:
         except (ValueError, AttributeError):
             return None
 
-    def insert_to_supabase(self, project_data: Dict[str, Any]) -> bool:
+    def _to_tender_row(self, project_data: Dict[str, Any], scraped_at: str) -> Dict[str, Any]:
+        # Nones are kept so every row has the same keys, as multi-row upserts require.
+        row = dict(zip(_TENDER_COLUMNS, map(project_data.get, _TENDER_KEYS)))
+        row["url"] = project_data.get("source_url", "")
+        row["scraped_at"] = scraped_at
+        row["has_documents"] = project_data.get("Has Documents") == "Yes"
+        row["number_of_trades"] = self._convert_to_int(project_data.get("Number of Trades"))
+        return row
+
+    def insert_to_supabase(self, project_data: Dict[str, Any]) -> None:
+        """Queue a project for the bulk upsert. Full batches are handed to the background writer,
+        so this never waits on the database; flush_inserts returns everything saved."""
+        self._insert_buffer.append(project_data)
+        if len(self._insert_buffer) >= self._insert_batch_size:
+            pending, self._insert_buffer = self._insert_buffer, []
+            if self._writer is None:
+                self._writer = asyncio.create_task(self._write_batches())
+            self._write_queue.put_nowait(pending)
+
+    async def _write_batches(self):
+        while (pending := await self._write_queue.get()) is not None:
+            self._written.extend(await self._write_batch(pending))
+
+    async def _upsert_tenders(self, pending: List[Dict[str, Any]], scraped_at: str) -> bool:
+        rows = [self._to_tender_row(project_data, scraped_at) for project_data in pending]
+        # Relies on the unique index from migrations/001_tenders_project_id_url_unique.sql
+        # so retries overwrite instead of duplicating.
+        result = await async_supabase.table("tenders").upsert(rows, on_conflict="project_id,url").execute()
+        if not result.data:
+            return False
+        saved_ids = {project_data.get("Project ID") for project_data in pending}
+        self._checked_ids.update(saved_ids)
+        self._known_ids.update(saved_ids)
+        return True
+
+    async def flush_inserts(self) -> List[Dict[str, Any]]:
+        """Write the partial batch and wait for the background writer; returns every project saved since the last flush."""
+        pending, self._insert_buffer = self._insert_buffer, []
+        saved = await self._write_batch(pending) if pending else []
+        if self._writer is not None:
+            self._write_queue.put_nowait(None)
+            writer, self._writer = self._writer, None
+            await writer
+        written, self._written = self._written, []
+        return written + saved
+
+    async def _write_batch(self, pending: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        scraped_at = datetime.now(timezone.utc).isoformat()
         try:
-            self.scraped_projects.append(project_data.copy())
-            supabase_data = {
-                "url": project_data.get("source_url", ""),
-                "scraped_at": datetime.utcnow().isoformat(),
-                "project_name": project_data.get("Project Name"),
-                "project_id": project_data.get("Project ID"),
-                "project_address": project_data.get("Project Address"),
-                "max_budget": project_data.get("Max Budget"),
-                "distance": project_data.get("Distance"),
-                "category": project_data.get("Category"),
-                "builder": project_data.get("Builder"),
-                "quote_due_builder": project_data.get("Quote Due (Builder)"),
-                "project_due_date": project_data.get("Project Due Date"),
-                "has_documents": project_data.get("Has Documents") == "Yes",
-                "interest_level": project_data.get("Interest Level"),
-                "number_of_trades": self._convert_to_int(project_data.get("Number of Trades")),
-                "submission_deadline": project_data.get("Submission Deadline"),
-                "overall_budget": project_data.get("Overall Budget"),
-                "builder_descriptions": project_data.get("Builder Descriptions"),
-                "row_number": project_data.get("Row Number")
-            }
-            supabase_data = {k: v for k, v in supabase_data.items() if v is not None}
-            result = supabase.table("tenders").insert(supabase_data).execute()
-            if result.data:
-                logger.info(f"Successfully saved project ID {project_data.get('Project ID')} to database")
-                return True
-            else:
-                logger.error(f"Failed to insert project to database - no data returned")
-                return False
+            if await self._upsert_tenders(pending, scraped_at):
+                logger.info(f"Saved {len(pending)} project(s) to database")
+                return pending
+            logger.error(f"Failed to insert {len(pending)} project(s) to database - no data returned")
         except Exception as e:
-            logger.error(f"Database insertion error for project ID {project_data.get('Project ID')}: {e}")
-            return False
+            if is_missing_conflict_target(e):
+                return []
+            logger.error(f"Database insertion error for {len(pending)} project(s): {e}")
+        if len(pending) == 1:
+            return []
+        # One bad row fails the whole batch, so retry row by row to save the rest.
+        saved = []
+        for project_data in pending:
+            try:
+                if await self._upsert_tenders([project_data], scraped_at):
+                    saved.append(project_data)
+            except Exception as e:
+                logger.error(f"Database insertion error for project {project_data.get('Project ID')}: {e}")
+        logger.info(f"Saved {len(saved)}/{len(pending)} project(s) after retrying individually")
+        return saved
 
-    def is_logged_in_ultra_fast(self, page: Page) -> bool:
+    async def is_logged_in_ultra_fast(self, page: Page) -> bool:
         try:
             current_url = page.url
             logger.debug(f"Checking login status on URL: {current_url}")
@@ -170,37 +432,30 @@ class EstimateOneAPIScraper:
                 logger.debug("Fast login verified - not on login page")
                 return True
             login_indicators = [
-                "tbody.styles__tenderRow__b2e48989c7e9117bd552",
-                ".styles__projectLink__bb24735487bba39065d8",
+                self.SELECTORS["row"],
+                self.SELECTORS["name"],
                 'input[placeholder*="Search by project name"]'
             ]
-            for indicator in login_indicators:
-                if page.query_selector(indicator):
-                    logger.debug(f"Fast login verified - found {indicator}")
-                    return True
+            if await page.query_selector(", ".join(login_indicators)):
+                logger.debug("Fast login verified - found logged-in element")
+                return True
             return False
         except Exception as e:
             logger.warning(f"Ultra-fast login check error: {e}")
             return False
 
-    def is_logged_in(self, page: Page) -> bool:
+    async def is_logged_in(self, page: Page) -> bool:
         try:
+            logged_in_indicators = [
+                self.SELECTORS["row"],
+                self.SELECTORS["name"]
+            ]
             try:
-                page.wait_for_load_state("domcontentloaded", timeout=3000)
+                if await page.wait_for_selector(", ".join(logged_in_indicators), timeout=1500):
+                    logger.debug("Login verified - found logged-in element")
+                    return True
             except:
                 pass
-            logged_in_indicators = [
-                "tbody.styles__tenderRow__b2e48989c7e9117bd552",
-                ".styles__projectLink__bb24735487bba39065d8"
-            ]
-            for indicator in logged_in_indicators:
-                try:
-                    element = page.wait_for_selector(indicator, timeout=1500)
-                    if element:
-                        logger.debug(f"Login verified - found element with selector: {indicator}")
-                        return True
-                except:
-                    continue
             current_url = page.url
             if not "/auth/login" in current_url and "estimateone.com" in current_url:
                 logger.debug(f"Login verified - on main app page: {current_url}")
@@ -210,16 +465,25 @@ class EstimateOneAPIScraper:
             logger.warning(f"Error checking login status: {e}")
             return False
 
-    def login_to_estimate_one_fast(self, page: Page) -> bool:
+    async def login_to_estimate_one_fast(self, page: Page) -> bool:
+        # The login form may depend on third-party scripts, so relax the allowlist while it runs,
+        # for this page's context only: other workers keep blocking.
+        self._relaxed_contexts.add(page.context)
+        try:
+            return await self._login_to_estimate_one(page)
+        finally:
+            self._relaxed_contexts.discard(page.context)
+
+    async def _login_to_estimate_one(self, page: Page) -> bool:
         try:
             logger.info("Starting login attempt...")
-            page.goto(self.login_url, timeout=10000, wait_until="commit")
-            page.wait_for_selector("#user_log_in_email", timeout=8000)
-            page.fill("#user_log_in_email", self.email)
-            page.fill("#user_log_in_plainPassword", self.password)
-            page.click("button.btn.btn-block.btn-lg.btn-primary")
+            await page.goto(self.login_url, timeout=10000, wait_until="commit")
+            await page.wait_for_selector("#user_log_in_email", timeout=8000)
+            await page.fill("#user_log_in_email", self.email)
+            await page.fill("#user_log_in_plainPassword", self.password)
+            await page.click("button.btn.btn-block.btn-lg.btn-primary")
             try:
-                page.wait_for_function(
+                await page.wait_for_function(
                     "() => !window.location.href.includes('/auth/login')",
                     timeout=20000
                 )
@@ -228,7 +492,7 @@ class EstimateOneAPIScraper:
             except Exception as e1:
                 logger.debug(f"URL change method failed: {e1}")
                 try:
-                    page.wait_for_selector("tbody.styles__tenderRow__b2e48989c7e9117bd552", timeout=10000)
+                    await page.wait_for_selector(self.SELECTORS["row"], timeout=10000)
                     logger.info("Login successful - found project rows")
                     return True
                 except Exception as e2:
@@ -244,241 +508,156 @@ class EstimateOneAPIScraper:
             logger.error(f"Login error: {e}")
             return False
 
-    def click_read_more_if_present(self, page: Page, item_element):
-        try:
-            read_more_selectors = [
-                "a.styles__hideShow__e8f2d705067479d13623",
-                "a[href='#project-details']",
-                "a:has-text('Read more')",
-                ".styles__hideShowWrapper__cf01bc021f03d3785134 a"
-            ]
-            for selector in read_more_selectors:
-                read_more_elem = item_element.query_selector(selector)
-                if read_more_elem:
-                    read_more_elem.scroll_into_view_if_needed()
-                    page.evaluate("el => el.click()", read_more_elem)
-                    time.sleep(0.8)
-                    return True
-            return False
-        except Exception as e:
-            logger.debug(f"Error in Read More clicking: {e}")
-            return False
-
-    def extract_full_description_advanced(self, page: Page, item_element) -> tuple:
-        self.click_read_more_if_present(page, item_element)
-        raw = item_element.inner_text().strip()
+    def _split_description(self, raw: str) -> tuple:
         if not raw:
             return "", ""
-        parts = re.split(r'(?i)their approximate budget is|approximate budget', raw, 1)
+        parts = _BUDGET_SPLIT_RE.split(raw, 1)
         full_desc = parts[0].strip()
         builder_budget = ""
         if len(parts) > 1:
-            m = re.search(
-                r'\$[\d,]+(?:\.\d+)?[mk]?\s*-\s*\$[\d,]+(?:\.\d+)?[mk]?|\$[\d,]+(?:\.\d+)?[mk]?',
-                parts[1]
-            )
+            m = _BUDGET_VALUE_RE.search(parts[1])
             if m:
                 builder_budget = m.group(0).strip()
         return full_desc, builder_budget
 
-    def extract_project_details_fast(self, page: Page) -> Dict[str, Any]:
+    def _parse_popup(self, popup: Dict[str, Any]) -> Dict[str, Any]:
         details = {}
-        try:
-            logger.debug("Extracting project details from popup...")
-            detail_selectors = [
-                "#project-details",
-                ".styles__projectSection__f1b9aeb71ec0b48e56e0",
-                ".ReactModal__Content"
-            ]
-            details_section = None
-            for selector in detail_selectors:
-                try:
-                    page.wait_for_selector(selector, timeout=800)
-                    details_section = page.query_selector(selector)
-                    if details_section:
-                        logger.debug(f"Found details section with selector: {selector}")
-                        break
-                except:
-                    continue
-            if not details_section:
-                details_section = page.query_selector(".ReactModal__Content, [role='dialog']")
-                if details_section:
-                    logger.debug("Found details section with fallback selector")
-            if not details_section:
-                logger.warning("No details section found")
-                return details
-            read_btn = details_section.query_selector("a.styles__hideShow__e8f2d705067479d13623")
-            if read_btn:
-                read_btn.scroll_into_view_if_needed()
-                page.evaluate("el => el.click()", read_btn)
-                time.sleep(1.2)
-            all_text = details_section.inner_text().strip()
-            project_name_elem = details_section.query_selector("h1, h2, h3, .project-title, [class*='title']")
-            if project_name_elem:
-                details["Project Name"] = project_name_elem.inner_text().strip()
-            address_selectors = [
-                ".styles__projectAddress__e13a9deabdbf43356939",
-                "[class*='address']",
-                "[class*='location']"
-            ]
-            for selector in address_selectors:
-                address_elem = details_section.query_selector(selector)
-                if address_elem:
-                    details["Project Address"] = address_elem.inner_text().strip()
-                    break
-            trades_match = re.search(r'(\d+)\s+trades', all_text)
-            if trades_match:
-                details["Number of Trades"] = trades_match.group(1)
-            deadline_match = re.search(r'submitted by\s+(.+?)\.', all_text)
-            if deadline_match:
-                details["Submission Deadline"] = deadline_match.group(1).strip()
-            overall_budget_elem = details_section.query_selector(".styles__budgetRange__b101ae22d71fd54397d0")
-            if overall_budget_elem:
-                details["Overall Budget"] = overall_budget_elem.inner_text().strip()
-            builder_descriptions = []
-            description_items = details_section.query_selector_all(".styles__stageDescription__a6f572d1edbede52b379")
-            for item in description_items:
-                description_data = {}
-                builder_name_elem = item.query_selector("strong")
-                if builder_name_elem:
-                    builder_text = builder_name_elem.inner_text().strip()
-                    builder_name = builder_text.replace(" says:", "").strip()
-                    description_data["builder_name"] = builder_name
-                full_description, builder_budget = self.extract_full_description_advanced(page, item)
-                if full_description:
-                    description_data["description"] = full_description
-                if builder_budget:
-                    description_data["builder_budget"] = builder_budget
-                if description_data:
-                    builder_descriptions.append(description_data)
-            if builder_descriptions:
-                details["Builder Descriptions"] = builder_descriptions
-            logger.debug(f"Successfully extracted {len(details)} fields from popup")
-            return details
-        except Exception as e:
-            logger.warning(f"Fast extraction error (continuing): {e}")
-            return details
+        all_text = popup["text"]
+        if popup["name"] is not None:
+            details["Project Name"] = popup["name"]
+        if popup["address"] is not None:
+            details["Project Address"] = popup["address"]
+        trades_match = _TRADES_RE.search(all_text)
+        if trades_match:
+            details["Number of Trades"] = trades_match.group(1)
+        deadline_match = _DEADLINE_RE.search(all_text)
+        if deadline_match:
+            details["Submission Deadline"] = deadline_match.group(1).strip()
+        if popup["budget"] is not None:
+            details["Overall Budget"] = popup["budget"]
+        builder_descriptions = []
+        for item in popup["descriptions"]:
+            description_data = {}
+            if item["builder"] is not None:
+                description_data["builder_name"] = item["builder"].replace(" says:", "").strip()
+            full_description, builder_budget = self._split_description(item["text"])
+            if full_description:
+                description_data["description"] = full_description
+            if builder_budget:
+                description_data["builder_budget"] = builder_budget
+            if description_data:
+                builder_descriptions.append(description_data)
+        if builder_descriptions:
+            details["Builder Descriptions"] = builder_descriptions
+        return details
+
+    async def open_project_popup(self, project_link, keys: List[str | None]) -> Dict[str, Any]:
+        """Click a project link and read its popup in one evaluate.
+
+        ``keys`` (project ID, name) identify the project's modal; returns {} if it never opens.
+        """
+        popup = await project_link.evaluate(self.OPEN_POPUP_JS, [self.SELECTORS, [key for key in keys if key]])
+        if popup is None:
+            logger.warning(f"Popup for project {keys[0]} did not open")
+            return {}
+        details = self._parse_popup(popup)
+        logger.debug(f"Successfully extracted {len(details)} fields from popup")
+        return details
 
-    def extract_single_project_row(self, row_element) -> Dict[str, Any]:
-        record = {}
+    async def wait_for_rows(self, page: Page, timeout: int):
+        """Return as soon as a listing row is in the DOM instead of waiting for the page to load."""
+        started = time.perf_counter()
+        await page.wait_for_selector(self.SELECTORS["row"], state="attached", timeout=timeout)
+        logger.debug(f"Listing rows attached after {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    async def list_row_project_ids(self, page: Page) -> List[str | None]:
+        """Project ID of every listing row, in row order, read in a single evaluate."""
+        return await page.eval_on_selector_all(self.SELECTORS["row"], self.ROW_IDS_JS, self.SELECTORS["id"])
+
+    async def extract_single_project_row(self, row_element) -> Dict[str, Any]:
         try:
-            project_name_elem = row_element.query_selector(".styles__projectLink__bb24735487bba39065d8")
-            if project_name_elem:
-                record["Project Name"] = project_name_elem.inner_text().strip()
-            project_id_elem = row_element.query_selector(".styles__projectId__a99146050623e131a1bf")
-            if project_id_elem:
-                record["Project ID"] = project_id_elem.inner_text().strip()
-            address_elem = row_element.query_selector(".styles__projectAddress__e13a9deabdbf43356939")
-            if address_elem:
-                record["Project Address"] = address_elem.inner_text().strip()
-            budget_elem = row_element.query_selector(".styles__budgetRange__b101ae22d71fd54397d0")
-            if budget_elem:
-                record["Max Budget"] = budget_elem.inner_text().strip()
-            distance_cells = row_element.query_selector_all("td")
-            for cell in distance_cells:
-                text = cell.inner_text().strip()
-                if "km" in text and text.endswith("km"):
-                    record["Distance"] = text
-                    break
-            category_elem = row_element.query_selector(".styles__lowPriority__ca01365a4bba34b27c8a span")
-            if category_elem:
-                record["Category"] = category_elem.inner_text().strip()
-            builder_elem = row_element.query_selector(".styles__builderName__f71d1b6dc7d0969616ea")
-            if builder_elem:
-                record["Builder"] = builder_elem.inner_text().strip()
-            quote_date_elem = row_element.query_selector(".styles__quoteDate__b21c670d4b980f23ba7c .styles__projectDate__efdf1ddef6a4526d58ac")
-            if quote_date_elem:
-                record["Quote Due (Builder)"] = quote_date_elem.inner_text().strip()
-            project_due_elems = row_element.query_selector_all(".styles__projectDate__efdf1ddef6a4526d58ac")
-            if len(project_due_elems) > 1:
-                record["Project Due Date"] = project_due_elems[-1].inner_text().strip()
-            elif len(project_due_elems) == 1:
-                record["Project Due Date"] = project_due_elems[0].inner_text().strip()
-            no_docs_elem = row_element.query_selector(".styles__noDocsTag__d3dc744a652a94be3eea")
-            record["Has Documents"] = "No" if no_docs_elem else "Yes"
-            interest_elem = row_element.query_selector(".reactSelect__single-value")
-            if interest_elem:
-                record["Interest Level"] = interest_elem.inner_text().strip()
-            else:
-                record["Interest Level"] = "Please Select"
-            return record
+            record = await row_element.evaluate(self.ROW_JS, self.SELECTORS)
+            return {field: value for field, value in record.items() if value is not None}
         except Exception as e:
             if "Connection closed" in str(e) or "Target page" in str(e):
                 logger.warning(f"Browser connection lost during extraction: {e}")
-                return {}
             else:
                 logger.warning(f"Error extracting single project row: {e}")
-                return record
+            return {}
 
-    def close_popup_fast(self, page: Page):
+    async def close_popup_fast(self, page: Page):
         try:
             logger.debug("Closing popup...")
-            page.keyboard.press("Escape")
+            await page.keyboard.press("Escape")
             try:
-                page.wait_for_selector(".ReactModal__Overlay--after-open", state="hidden", timeout=300)
+                await page.wait_for_selector(".ReactModal__Overlay--after-open", state="hidden", timeout=300)
                 return "success"
             except:
-                page.keyboard.press("Escape")
+                await page.keyboard.press("Escape")
                 return "success"
         except Exception as e:
             logger.debug(f"Popup close error (continuing): {e}")
             return "success"
 
-    def search_project_by_id_and_extract_row_data(self, page: Page, project_id: str) -> Dict[str, Any]:
+    async def search_project_by_id_and_extract_row_data(self, page: Page, project_id: str) -> Dict[str, Any]:
+        project_data = await self._search_project_by_id(page, project_id)
+        # A search that comes back empty on the login page means the session expired,
+        # not that the project is missing.
+        if not project_data and "/auth/login" in page.url:
+            raise EstimateOneSessionExpired(f"Redirected to login while searching for project {project_id}")
+        return project_data
+
+    async def _search_project_by_id(self, page: Page, project_id: str) -> Dict[str, Any]:
         try:
             logger.debug(f"Searching for project ID: {project_id}")
             current_url = page.url
             if "search" in current_url.lower() or "project" in current_url.lower():
                 logger.debug("Navigating back to main tenders page...")
-                page.goto("https://app.estimateone.com/tenders", wait_until="commit", timeout=8000)
-                time.sleep(1)
+                await page.goto("https://app.estimateone.com/tenders", wait_until="commit", timeout=8000)
             search_input_selector = 'input[placeholder*="Search by project name, project id, address, brand or product"]'
-            page.wait_for_selector(search_input_selector, timeout=5000)
-            page.click(search_input_selector)
-            page.fill(search_input_selector, "")
-            page.fill(search_input_selector, project_id)
+            await page.wait_for_selector(search_input_selector, timeout=5000)
+            await page.click(search_input_selector)
+            await page.fill(search_input_selector, "")
+            await page.fill(search_input_selector, project_id)
             search_button_selector = 'button.btn.btn-primary.ml-1.fs-ignore-dead-clicks'
             try:
-                page.wait_for_selector(search_button_selector, timeout=2000)
-                page.click(search_button_selector)
+                await page.wait_for_selector(search_button_selector, timeout=2000)
+                await page.click(search_button_selector)
                 logger.debug("Clicked search button")
-                time.sleep(2)
             except:
-                page.keyboard.press("Enter")
+                await page.keyboard.press("Enter")
                 logger.debug("Pressed Enter key as fallback")
-                time.sleep(2)
+            try:
+                await page.wait_for_selector(f'{self.SELECTORS["autocomplete"]}, {self.SELECTORS["row"]}', timeout=3000)
+            except:
+                pass
             project_data = {}
             try:
-                page.wait_for_selector('.styles__autocomplete__d2da89763ad53db5dcf7', timeout=3000)
+                await page.wait_for_selector(self.SELECTORS["autocomplete"], timeout=3000)
                 logger.debug("Found autocomplete dropdown")
-                suggested_project = page.query_selector('.styles__suggestedProject__f400d5576aec8e4ea183 a')
+                suggested_project = await page.query_selector('.styles__suggestedProject__f400d5576aec8e4ea183 a')
                 if suggested_project:
                     logger.debug(f"Found project {project_id} in autocomplete - clicking...")
-                    suggested_project.click()
-                    time.sleep(1)
-                    popup_data = self.extract_project_details_fast(page)
+                    popup_data = await self.open_project_popup(suggested_project, [project_id])
                     project_data.update(popup_data)
                     return project_data
             except:
                 logger.debug("No autocomplete dropdown, checking for search results page...")
                 try:
-                    page.wait_for_selector("tbody.styles__tenderRow__b2e48989c7e9117bd552", timeout=5000)
+                    await self.wait_for_rows(page, timeout=5000)
                     logger.debug("Found search results page")
-                    project_rows = page.query_selector_all("tbody.styles__tenderRow__b2e48989c7e9117bd552")
-                    for idx, row in enumerate(project_rows):
-                        project_id_elem = row.query_selector(".styles__projectId__a99146050623e131a1bf")
-                        if project_id_elem:
-                            row_project_id = project_id_elem.inner_text().strip()
-                            if project_id in row_project_id:
-                                logger.debug(f"Found matching project {project_id} in search results")
-                                project_data = self.extract_single_project_row(row)
-                                project_link = row.query_selector(".styles__projectLink__bb24735487bba39065d8")
-                                if project_link:
-                                    project_link.click()
-                                    time.sleep(1)
-                                    popup_data = self.extract_project_details_fast(page)
-                                    project_data.update(popup_data)
-                                return project_data
+                    row_index = await page.eval_on_selector_all(
+                        self.SELECTORS["row"], self.FIND_ROW_JS, [self.SELECTORS["id"], project_id]
+                    )
+                    if row_index >= 0:
+                        logger.debug(f"Found matching project {project_id} in search results")
+                        row = await page.locator(self.SELECTORS["row"]).nth(row_index).element_handle()
+                        project_data = await self.extract_single_project_row(row)
+                        project_link = await row.query_selector(self.SELECTORS["name"])
+                        if project_link:
+                            popup_data = await self.open_project_popup(project_link, [project_id, project_data.get("Project Name")])
+                            project_data.update(popup_data)
+                        return project_data
                 except Exception as search_error:
                     logger.warning(f"Error in search results processing: {search_error}")
                     logger.warning(f"Project {project_id} not found in search results")
@@ -488,173 +667,298 @@ class EstimateOneAPIScraper:
             logger.error(f"Error searching for project {project_id}: {e}")
             return {}
 
-def _scrape_estimate_one_sync(url: str, estimate_one_email: str, estimate_one_password: str) -> Tuple[int, dict, None]:
+async def _run_workers(*workers):
+    """Run worker coroutines together; if one fails, cancel and await the others before re-raising,
+    so none is left scraping or queueing inserts after the caller's cleanup."""
+    tasks = [asyncio.ensure_future(worker) for worker in workers]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+class ProjectResult(NamedTuple):
+    pid: str
+    ok: bool
+    msg: str
+    data: Dict[str, Any] | None
+
+_LISTING_CONTEXT_OPTIONS = {
+    "viewport": {'width': 1280, 'height': 720},
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    "ignore_https_errors": True,
+}
+
+async def _new_listing_context(scraper: EstimateOneAPIScraper, **options):
+    context = await browser_pool.checkout(scraper, **_LISTING_CONTEXT_OPTIONS, **options)
+    context.set_default_timeout(8000)
+    return context
+
+async def _popup_worker(scraper: EstimateOneAPIScraper, page: Page, queue: asyncio.Queue):
+    """Drain queued rows, opening each project's popup on this worker's own copy of the listing."""
+    await scraper.wait_for_rows(page, timeout=10000)
+    project_rows = await page.query_selector_all(scraper.SELECTORS["row"])
+    rows_by_id = dict(zip(await scraper.list_row_project_ids(page), project_rows))
+    while not queue.empty():
+        project_data = queue.get_nowait()
+        row = rows_by_id.get(project_data["Project ID"])
+        project_link = await row.query_selector(scraper.SELECTORS["name"]) if row else None
+        if project_link:
+            try:
+                detailed_info = await scraper.open_project_popup(
+                    project_link, [project_data["Project ID"], project_data.get("Project Name")]
+                )
+                project_data.update(detailed_info)
+                await scraper.close_popup_fast(page)
+            except Exception as e:
+                logger.warning(f"Error processing popup for project {project_data['Row Number']}: {e}")
+                await page.keyboard.press("Escape")
+        scraper.insert_to_supabase(project_data)
+
+async def _extra_popup_worker(scraper, url, storage_state, queue, contexts):
+    try:
+        context = await _new_listing_context(scraper, storage_state=storage_state)
+        contexts.append(context)
+        page = await browser_pool.new_page(context)
+        await page.goto(url, wait_until="commit", timeout=15000)
+        await _popup_worker(scraper, page, queue)
+    except Exception as e:
+        # Whatever this worker leaves in the queue is picked up by the others.
+        logger.warning(f"Popup worker stopped early: {e}")
+
+async def _scrape_estimate_one(url: str, estimate_one_email: str, estimate_one_password: str) -> Tuple[int, dict, None]:
     rows_inserted, preview = 0, {}
-    skipped_duplicates = 0
     scraper = EstimateOneAPIScraper(email=estimate_one_email, password=estimate_one_password)
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox','--disable-dev-shm-usage','--disable-gpu','--disable-extensions','--disable-plugins',
-                '--memory-pressure-off','--max_old_space_size=2048',
-                '--disable-background-timer-throttling','--disable-backgrounding-occluded-windows','--disable-renderer-backgrounding',
-                '--disable-features=TranslateUI','--disable-ipc-flooding-protection'
-            ]
-        )
-        context = browser.new_context(
-            viewport={'width': 1280, 'height': 720},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            ignore_https_errors=True
-        )
-        context.route("**/*", scraper.block_resources_aggressive)
-        context.set_default_timeout(8000)
-        page = context.new_page()
-        try:
-            logger.info(f"Opening EstimateOne URL: {url}")
-            page.goto(url, wait_until="commit", timeout=15000)
-            if not scraper.is_logged_in_ultra_fast(page):
-                if not scraper.get_cached_session():
-                    logger.info("Need to login...")
-                    if scraper.login_to_estimate_one_fast(page):
-                        scraper.cache_session()
-                        page.goto(url, wait_until="commit", timeout=10000)
-                    else:
-                        raise RuntimeError("Login failed")
-                else:
-                    page.reload(wait_until="commit", timeout=8000)
-                if not scraper.is_logged_in(page):
-                    logger.info("Cached session invalid, need fresh login...")
-                    if scraper.login_to_estimate_one_fast(page):
-                        scraper.cache_session()
-                        page.goto(url, wait_until="commit", timeout=10000)
-                    else:
-                        raise RuntimeError("Login failed")
-            logger.debug("Waiting for project rows to load...")
-            page.wait_for_selector("tbody.styles__tenderRow__b2e48989c7e9117bd552", timeout=10000)
-            project_rows = page.query_selector_all("tbody.styles__tenderRow__b2e48989c7e9117bd552")
-            logger.info(f"Found {len(project_rows)} project rows")
-            if not project_rows:
-                raise RuntimeError("No project rows found on page")
-            all_project_ids = []
-            for i, row in enumerate(project_rows, 1):
-                project_id_elem = row.query_selector(".styles__projectId__a99146050623e131a1bf")
-                if project_id_elem:
-                    project_id = project_id_elem.inner_text().strip()
-                    all_project_ids.append((i, project_id, row))
-                else:
-                    logger.warning(f"Could not extract project ID from row {i}")
-            projects_to_process = []
-            for row_num, project_id, row_element in all_project_ids:
-                if not scraper.check_project_exists_early(project_id):
-                    projects_to_process.append((row_num, project_id, row_element))
-                else:
-                    skipped_duplicates += 1
-            for row_num, project_id, row in projects_to_process:
-                project_data = scraper.extract_single_project_row(row)
-                if project_data:
-                    project_data["Row Number"] = row_num
-                    project_data["source_url"] = url
-                    project_data["scraped_at"] = datetime.now().isoformat()
-                    project_link = row.query_selector(".styles__projectLink__bb24735487bba39065d8")
-                    if project_link:
-                        try:
-                            project_link.click(force=True)
-                            try:
-                                page.wait_for_selector("[class*='project'], .ReactModal__Content, #project-details", timeout=2000)
-                            except:
-                                pass
-                            detailed_info = scraper.extract_project_details_fast(page)
-                            project_data.update(detailed_info)
-                            scraper.close_popup_fast(page)
-                        except Exception as e:
-                            logger.warning(f"Error processing popup for project {row_num}: {e}")
-                            page.keyboard.press("Escape")
-                    if scraper.insert_to_supabase(project_data):
-                        rows_inserted += 1
-                        if not preview:
-                            preview = {
-                                "project_name": project_data.get("Project Name"),
-                                "project_id": project_data.get("Project ID"),
-                                "category": project_data.get("Category"),
-                                "max_budget": project_data.get("Max Budget"),
-                                "number_of_trades": project_data.get("Number of Trades")
-                            }
-        finally:
-            context.close()
-            browser.close()
+    context = await _new_listing_context(scraper)
+    contexts = [context]
+    try:
+        page = await browser_pool.new_page(context)
+        logger.info(f"Opening EstimateOne URL: {url}")
+        _raise_for_status(await page.goto(url, wait_until="commit", timeout=15000))
+        if not await scraper.is_logged_in_ultra_fast(page):
+            logger.info("Need to login...")
+            if not await scraper.login_to_estimate_one_fast(page):
+                raise EstimateOneLoginError("Login failed")
+            await scraper.cache_session(context)
+            await page.goto(url, wait_until="commit", timeout=10000)
+        logger.debug("Waiting for project rows to load...")
+        await scraper.wait_for_rows(page, timeout=10000)
+        project_rows = await page.query_selector_all(scraper.SELECTORS["row"])
+        logger.info(f"Found {len(project_rows)} project rows")
+        if not project_rows:
+            raise RuntimeError("No project rows found on page")
+        all_project_ids = []
+        row_project_ids = await scraper.list_row_project_ids(page)
+        for i, (row, project_id) in enumerate(zip(project_rows, row_project_ids), 1):
+            if project_id:
+                all_project_ids.append((i, project_id, row))
+            else:
+                logger.warning(f"Could not extract project ID from row {i}")
+        new_ids, _ = await scraper.filter_duplicate_project_ids([project_id for _, project_id, _ in all_project_ids])
+        new_ids = set(new_ids)
+        projects_to_process = [entry for entry in all_project_ids if entry[1] in new_ids]
+        popup_queue: asyncio.Queue = asyncio.Queue()
+        for row_num, project_id, row in projects_to_process:
+            project_data = await scraper.extract_single_project_row(row)
+            if project_data:
+                project_data["Project ID"] = project_id
+                project_data["Row Number"] = row_num
+                project_data["source_url"] = url
+                popup_queue.put_nowait(project_data)
+        if not popup_queue.empty():
+            # Popups are independent, so extra contexts share this one's login and
+            # work through the queue alongside the original page.
+            storage_state = await context.storage_state()
+            extra_workers = min(POPUP_WORKERS, popup_queue.qsize()) - 1
+            await _run_workers(
+                _popup_worker(scraper, page, popup_queue),
+                *(
+                    _extra_popup_worker(scraper, url, storage_state, popup_queue, contexts)
+                    for _ in range(extra_workers)
+                ),
+            )
+    finally:
+        saved = await scraper.flush_inserts()
+        for open_context in contexts:
+            await browser_pool.checkin(open_context)
+    rows_inserted = len(saved)
+    if saved:
+        preview = {
+            "project_name": saved[0].get("Project Name"),
+            "project_id": saved[0].get("Project ID"),
+            "category": saved[0].get("Category"),
+            "max_budget": saved[0].get("Max Budget"),
+            "number_of_trades": saved[0].get("Number of Trades")
+        }
     return rows_inserted, preview, None
 
-def _scrape_projects_by_ids_sync(
+async def _scrape_projects_by_ids(
     project_ids: List[str],
     url: str,
     estimate_one_email: str,
-    estimate_one_password: str
+    estimate_one_password: str,
+    progress: asyncio.Queue | None = None
 ) -> dict:
+    """Search and save each project ID.
+
+    If ``progress`` is given, a "scraped" event is put on it as soon as a worker has a project's
+    data, and a "saved" or "failed" event once the project is settled; saves are confirmed in
+    batches, when flush_inserts writes them.
+    """
     results = {"processed": 0, "failed": 0, "details": [], "sample_project": {}, "json_file_path": None}
-    successfully_processed_ids = []
+    outcomes: List[ProjectResult] = []
+    queued = []
+
+    def record(outcome: ProjectResult):
+        outcomes.append(outcome)
+        if progress is not None:
+            status = "saved" if outcome.ok else "failed"
+            progress.put_nowait({"type": "progress", "pid": outcome.pid, "status": status, "detail": outcome.msg})
+
+    def record_saved(saved: List[Dict[str, Any]]):
+        for project_data in saved:
+            record(ProjectResult(project_data["Project ID"], True, "Successfully processed", project_data))
+
     scraper = EstimateOneAPIScraper(email=estimate_one_email, password=estimate_one_password)
-    new_project_ids, duplicate_project_ids = scraper.filter_duplicate_project_ids(project_ids)
+    new_project_ids, duplicate_project_ids = await scraper.filter_duplicate_project_ids(project_ids)
     if duplicate_project_ids:
         for dup_id in duplicate_project_ids:
             results["details"].append(f"Project {dup_id}: SKIPPED (already exists in database)")
+            if progress is not None:
+                progress.put_nowait({"type": "progress", "pid": dup_id, "status": "skipped", "detail": "Already exists in database"})
     if not new_project_ids:
         results["successfully_processed_ids"] = duplicate_project_ids
         return results
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox','--disable-dev-shm-usage','--disable-gpu','--disable-extensions','--disable-plugins'
-            ]
-        )
-        context = browser.new_context()
-        context.route("**/*", scraper.block_resources_aggressive)
-        page = context.new_page()
+    # Only the browser work takes a scrape slot, so a request whose IDs are all saved
+    # already returns without queueing behind running scrapes.
+    async with scrape_semaphore:
+        context = await browser_pool.checkout(scraper)
+        contexts = [context]
         try:
+            page = await browser_pool.new_page(context)
             logger.info(f"Opening EstimateOne URL: {url}")
-            page.goto(url, wait_until="commit")
-            if not scraper.is_logged_in_ultra_fast(page):
+            _raise_for_status(await page.goto(url, wait_until="commit"))
+            if not await scraper.is_logged_in_ultra_fast(page):
                 logger.info("Not logged in, attempting login...")
-                if not scraper.login_to_estimate_one_fast(page):
-                    raise RuntimeError("Login failed")
+                if not await scraper.login_to_estimate_one_fast(page):
+                    raise EstimateOneLoginError("Login failed")
+                await scraper.cache_session(context)
                 logger.info("Login successful, navigating back to main page...")
-                page.goto(url, wait_until="commit")
-            for i, project_id in enumerate(new_project_ids, 1):
+                await page.goto(url, wait_until="commit")
+            search_queue: asyncio.Queue = asyncio.Queue()
+            for project_id in new_project_ids:
+                search_queue.put_nowait(project_id)
+
+            async def relogin(worker_page: Page, project_id: str):
+                logger.warning(f"EstimateOne session expired at project {project_id}, logging in again...")
+                if not await scraper.login_to_estimate_one_fast(worker_page):
+                    raise EstimateOneLoginError("Login failed after session expired")
+                await scraper.cache_session(worker_page.context)
+                await worker_page.goto(url, wait_until="commit")
+
+            async def search_worker(worker_page: Page):
+                relogged_in = False
+                while not search_queue.empty():
+                    project_id = search_queue.get_nowait()
+                    try:
+                        try:
+                            project_data = await scraper.search_project_by_id_and_extract_row_data(worker_page, project_id)
+                        except EstimateOneSessionExpired:
+                            # Log in again once per worker and retry the same project; a second
+                            # expiry propagates as a login failure.
+                            if relogged_in:
+                                raise
+                            relogged_in = True
+                            await relogin(worker_page, project_id)
+                            project_data = await scraper.search_project_by_id_and_extract_row_data(worker_page, project_id)
+                        if not project_data:
+                            record(ProjectResult(project_id, False, "Not found in search", None))
+                            continue
+                        project_data["Project ID"] = project_id
+                        project_data["source_url"] = url
+                        queued.append(project_data)
+                        scraper.insert_to_supabase(project_data)
+                        if progress is not None:
+                            progress.put_nowait({"type": "progress", "pid": project_id, "status": "scraped", "detail": "Queued for saving"})
+                    except EstimateOneLoginError:
+                        # Every remaining search would land on the login page too.
+                        raise
+                    except Exception as e:
+                        record(ProjectResult(project_id, False, str(e), None))
+
+            async def extra_search_worker(storage_state):
                 try:
-                    project_data = scraper.search_project_by_id_and_extract_row_data(page, project_id)
-                    if not project_data:
-                        results["failed"] += 1
-                        results["details"].append(f"Project {project_id}: Not found in search")
-                        continue
-                    project_data["Project ID"] = project_id
-                    project_data["source_url"] = url
-                    project_data["scraped_at"] = datetime.now().isoformat()
-                    if scraper.insert_to_supabase(project_data):
-                        results["processed"] += 1
-                        successfully_processed_ids.append(project_id)
-                        if not results["sample_project"]:
-                            results["sample_project"] = {
-                                "project_name": project_data.get("Project Name"),
-                                "project_id": project_data.get("Project ID"),
-                                "overall_budget": project_data.get("Overall Budget"),
-                                "number_of_trades": project_data.get("Number of Trades")
-                            }
-                        results["details"].append(f"Project {project_id}: Successfully processed")
-                    else:
-                        results["failed"] += 1
-                        results["details"].append(f"Project {project_id}: Database insertion failed")
+                    worker_context = await browser_pool.checkout(scraper, storage_state=storage_state)
+                    contexts.append(worker_context)
+                    worker_page = await browser_pool.new_page(worker_context)
+                    await worker_page.goto(url, wait_until="commit")
                 except Exception as e:
-                    results["failed"] += 1
-                    error_msg = f"Project {project_id}: {str(e)}"
-                    results["details"].append(error_msg)
-                    logger.error(f"Error processing project {project_id}: {e}")
+                    # Whatever this worker would have searched is picked up by the others.
+                    logger.warning(f"Search worker failed to start: {e}")
+                    return
+                await search_worker(worker_page)
+
+            # Searches are independent, so extra contexts reuse this one's login and
+            # share the queue with the original page.
+            extra_workers = min(SEARCH_WORKERS, len(new_project_ids)) - 1
+            storage_state = await context.storage_state() if extra_workers else None
+            await _run_workers(search_worker(page), *(extra_search_worker(storage_state) for _ in range(extra_workers)))
         finally:
-            context.close()
-            browser.close()
+            record_saved(await scraper.flush_inserts())
+            for open_context in contexts:
+                await browser_pool.checkin(open_context)
+    saved_ids = {outcome.pid for outcome in outcomes if outcome.ok}
+    for project_data in queued:
+        if project_data["Project ID"] not in saved_ids:
+            record(ProjectResult(project_data["Project ID"], False, "Database insertion failed", None))
+    successfully_processed_ids = [outcome.pid for outcome in outcomes if outcome.ok]
+    results["processed"] = len(successfully_processed_ids)
+    results["failed"] = len(outcomes) - results["processed"]
+    results["details"].extend(f"Project {outcome.pid}: {outcome.msg}" for outcome in outcomes)
+    # One record for the whole job rather than a log line per failed project.
+    failures = [(outcome.pid, outcome.msg) for outcome in outcomes if not outcome.ok]
+    if failures:
+        logger.error("Failed to process %d project(s): %s", len(failures), failures)
+    sample = next((outcome.data for outcome in outcomes if outcome.ok), None)
+    if sample:
+        results["sample_project"] = {
+            "project_name": sample.get("Project Name"),
+            "project_id": sample.get("Project ID"),
+            "overall_budget": sample.get("Overall Budget"),
+            "number_of_trades": sample.get("Number of Trades")
+        }
     results["successfully_processed_ids"] = successfully_processed_ids + duplicate_project_ids
     return results
 
+async def get_estimate_one_credentials(user_id: str) -> Tuple[str, str]:
+    if user_id in _CREDENTIALS:
+        return _CREDENTIALS[user_id]
+    # Concurrent requests for the same user share one fetch and decrypt.
+    lock = _CREDENTIAL_LOCKS.get(user_id)
+    if lock is None:
+        lock = _CREDENTIAL_LOCKS[user_id] = asyncio.Lock()
+    async with lock:
+        if user_id in _CREDENTIALS:
+            return _CREDENTIALS[user_id]
+        result = await (
+            async_supabase.table("user_credentials")
+            .select("email, password_encrypted")
+            .eq("user_id", user_id)
+            .eq("credential_type", "estimate_one")
+            .execute()
+        )
+        if not result.data:
+            raise HTTPException(
+                status_code=404,
+                detail="EstimateOne credentials not found. Please login again to store them."
+            )
+        credential_data = result.data[0]
+        credentials = (credential_data["email"], decrypt_password(credential_data["password_encrypted"]))
+        _CREDENTIALS[user_id] = credentials
+        return credentials
+
 @router.post("/scrape-tenders", response_model=EstimateOneResponse)
 async def scrape_estimate_one(req: EstimateOneRequest, authorization: str = Header(None)):
     url = req.url.strip()
@@ -666,29 +970,14 @@ async def scrape_estimate_one(req: EstimateOneRequest, authorization: str = Head
         raise HTTPException(status_code=401, detail="Authentication required. Please login first.")
     token = authorization.split(" ")[1]
     try:
-        user = await asyncio.to_thread(lambda: supabase.auth.get_user(token))
-        if not user.user:
+        user_id = await get_user_id(token)
+        if not user_id:
             raise HTTPException(status_code=401, detail="Authentication token expired. Please login again.")
-        user_id = user.user.id
         logger.info(f"Scraping request from user: {user_id}")
     except Exception as e:
         raise HTTPException(status_code=401, detail="Authentication failed. Please login again.")
     try:
-        result = await asyncio.to_thread(
-            lambda: supabase.table("user_credentials")
-            .select("email, password_encrypted")
-            .eq("user_id", user_id)
-            .eq("credential_type", "estimate_one")
-            .execute()
-        )
-        if not result.data:
-            raise HTTPException(
-                status_code=404,
-                detail="EstimateOne credentials not found. Please login again to store them."
-            )
-        credential_data = result.data[0]
-        estimate_one_email = credential_data["email"]
-        estimate_one_password = decrypt_password(credential_data["password_encrypted"])
+        estimate_one_email, estimate_one_password = await get_estimate_one_credentials(user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -699,21 +988,19 @@ async def scrape_estimate_one(req: EstimateOneRequest, authorization: str = Head
         )
     logger.info(f"Starting EstimateOne scrape request for URL: {url}")
     try:
-        loop = asyncio.get_event_loop()
-        rows, preview, _ = await loop.run_in_executor(
-            thread_pool,
-            _scrape_estimate_one_sync,
-            url,
-            estimate_one_email,
-            estimate_one_password
-        )
+        async with scrape_semaphore:
+            rows, preview, _ = await _scrape_estimate_one(
+                url,
+                estimate_one_email,
+                estimate_one_password
+            )
         return EstimateOneResponse(
             status="success",
             message=f"{rows} EstimateOne project(s) saved to Supabase.",
             data={
                 "projects_scraped": rows,
                 "sample_project": preview,
-                "scraped_at": datetime.utcnow().isoformat(),
+                "scraped_at": datetime.now(timezone.utc).isoformat(),
                 "source": "EstimateOne",
             },
             file_path=None,
@@ -735,40 +1022,29 @@ async def scrape_estimate_one(req: EstimateOneRequest, authorization: str = Head
             status_code=408,
             detail="EstimateOne login timeout. Please try again."
         )
+    except EstimateOneError as exc:
+        if isinstance(exc, EstimateOneLoginError):
+            _CREDENTIALS.pop(user_id, None)
+        logger.warning(f"EstimateOne scraping failed: {exc}")
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
     except Exception as exc:
-        error_msg = str(exc).lower()
-        if "invalid credentials" in error_msg or "login failed" in error_msg:
-            raise HTTPException(
-                status_code=401,
-                detail="EstimateOne login failed. Please check your credentials."
-            )
-        elif "page not found" in error_msg or "404" in error_msg:
-            raise HTTPException(
-                status_code=404,
-                detail="EstimateOne page not found. Please check the URL."
-            )
-        elif "access denied" in error_msg or "forbidden" in error_msg:
-            raise HTTPException(
-                status_code=403,
-                detail="Access denied to EstimateOne page. Check your account permissions."
-            )
-        else:
-            logger.error(f"EstimateOne scraping failed: {exc}\n{traceback.format_exc()}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Scraping failed: {type(exc).__name__}. Please try again or contact support."
-            )
+        logger.error(f"EstimateOne scraping failed: {exc}\n{traceback.format_exc()}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Scraping failed: {type(exc).__name__}. Please try again or contact support."
+        )
 
-@router.post("/scrape-project", response_model=EstimateOneResponse)
-async def scrape_projects_by_ids(
-    req: ProjectScrapeRequest,
-    authorization: str = Header(None)
-):
+async def _authorize_project_scrape(req: ProjectScrapeRequest, authorization: str | None) -> Tuple[str, str, str, str]:
+    """Validate a project-ID scrape request; returns (user_id, url, EstimateOne email, password)."""
     logger.info(f"Received project scrape request for {len(req.project_ids)} project IDs: {req.project_ids}")
     if not req.project_ids:
         raise HTTPException(400, "No project IDs provided")
     if not isinstance(req.project_ids, list):
         raise HTTPException(400, "project_ids must be a list")
+    # Repeated IDs would be searched twice; drop them (keeping order) before any I/O.
+    req.project_ids = list(dict.fromkeys(req.project_ids))
+    if len(req.project_ids) > MAX_PROJECT_IDS:
+        raise HTTPException(413, f"Too many project IDs ({len(req.project_ids)} > {MAX_PROJECT_IDS})")
     url = req.url.strip()
     if not url.startswith(("http://", "https://")):
         raise HTTPException(400, "Invalid URL format")
@@ -778,30 +1054,15 @@ async def scrape_projects_by_ids(
         raise HTTPException(status_code=401, detail="Authentication required. Please login first.")
     token = authorization.split(" ")[1]
     try:
-        user = await asyncio.to_thread(lambda: supabase.auth.get_user(token))
-        if not user.user:
+        user_id = await get_user_id(token)
+        if not user_id:
             raise HTTPException(status_code=401, detail="Authentication token expired. Please login again.")
-        user_id = user.user.id
         logger.info(f"Authentication successful for user: {user_id}")
     except Exception as e:
         logger.error(f"Authentication failed: {e}")
         raise HTTPException(status_code=401, detail="Authentication failed. Please login again.")
     try:
-        result = await asyncio.to_thread(
-            lambda: supabase.table("user_credentials")
-            .select("email, password_encrypted")
-            .eq("user_id", user_id)
-            .eq("credential_type", "estimate_one")
-            .execute()
-        )
-        if not result.data:
-            raise HTTPException(
-                status_code=404,
-                detail="EstimateOne credentials not found. Please login again to store them."
-            )
-        credential_data = result.data[0]
-        estimate_one_email = credential_data["email"]
-        estimate_one_password = decrypt_password(credential_data["password_encrypted"])
+        estimate_one_email, estimate_one_password = await get_estimate_one_credentials(user_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -810,50 +1071,68 @@ async def scrape_projects_by_ids(
             status_code=500,
             detail="Database connection failed. Please try again later."
         )
+    return user_id, url, estimate_one_email, estimate_one_password
+
+def _summarize_project_scrape(project_ids: List[str], results: dict) -> Tuple[str, str, dict]:
+    successfully_processed_ids = results.get("successfully_processed_ids", [])
+    if successfully_processed_ids:
+        logger.info(f"Successfully processed IDs (should be deleted from storage): {successfully_processed_ids}")
+    total_projects = len(project_ids)
+    processed_count = results["processed"]
+    failed_count = results["failed"]
+    if processed_count == 0 and failed_count == 0 and successfully_processed_ids:
+        # Every ID was already in the database, so nothing needed scraping.
+        message = f"All {total_projects} projects already exist in the database."
+        status = "success"
+    elif processed_count > 0 and failed_count == 0:
+        message = f"Successfully processed all {processed_count} projects."
+        status = "success"
+    elif processed_count > 0 and failed_count > 0:
+        message = f"Processed {processed_count}/{total_projects} projects. {failed_count} failed."
+        status = "partial_success"
+    else:
+        message = f"Failed to process any projects. {failed_count}/{total_projects} errors."
+        status = "failed"
+    response_data = {
+        "total_requested": total_projects,
+        "processed": processed_count,
+        "failed": failed_count,
+        "success_rate": f"{(processed_count/total_projects)*100:.1f}%",
+        "sample_project": results.get("sample_project", {}),
+        "error_details": results.get("details", []),
+        "successfully_processed_ids": successfully_processed_ids,
+        "scraped_at": datetime.now(timezone.utc).isoformat(),
+        "source": "EstimateOne Project Search",
+    }
+    logger.info(f"Project scraping completed. Status: {status}, Processed: {processed_count}, Failed: {failed_count}")
+    return status, message, response_data
+
+@router.post("/scrape-project", response_model=EstimateOneResponse)
+async def scrape_projects_by_ids(
+    req: ProjectScrapeRequest,
+    authorization: str = Header(None)
+):
+    user_id, url, estimate_one_email, estimate_one_password = await _authorize_project_scrape(req, authorization)
     logger.info(f"Starting project processing for {len(req.project_ids)} project IDs")
     try:
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            thread_pool,
-            _scrape_projects_by_ids_sync,
+        results = await _scrape_projects_by_ids(
             req.project_ids,
             url,
             estimate_one_email,
             estimate_one_password
         )
-        successfully_processed_ids = results.get("successfully_processed_ids", [])
-        if successfully_processed_ids:
-            logger.info(f"Successfully processed IDs (should be deleted from storage): {successfully_processed_ids}")
-        total_projects = len(req.project_ids)
-        processed_count = results["processed"]
-        failed_count = results["failed"]
-        if processed_count > 0 and failed_count == 0:
-            message = f"Successfully processed all {processed_count} projects."
-            status = "success"
-        elif processed_count > 0 and failed_count > 0:
-            message = f"Processed {processed_count}/{total_projects} projects. {failed_count} failed."
-            status = "partial_success"
-        else:
-            message = f"Failed to process any projects. {failed_count}/{total_projects} errors."
-            status = "failed"
-        response_data = {
-            "total_requested": total_projects,
-            "processed": processed_count,
-            "failed": failed_count,
-            "success_rate": f"{(processed_count/total_projects)*100:.1f}%",
-            "sample_project": results.get("sample_project", {}),
-            "error_details": results.get("details", []),
-            "successfully_processed_ids": successfully_processed_ids,
-            "scraped_at": datetime.utcnow().isoformat(),
-            "source": "EstimateOne Project Search",
-        }
-        logger.info(f"Project scraping completed. Status: {status}, Processed: {processed_count}, Failed: {failed_count}")
+        status, message, response_data = _summarize_project_scrape(req.project_ids, results)
         return EstimateOneResponse(
             status=status,
             message=message,
             data=response_data,
             file_path=None,
         )
+    except EstimateOneError as exc:
+        if isinstance(exc, EstimateOneLoginError):
+            _CREDENTIALS.pop(user_id, None)
+        logger.warning(f"Project scraping failed: {exc}")
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
     except Exception as exc:
         logger.error(f"Project scraping failed: {exc}")
         logger.debug(f"Traceback: {traceback.format_exc()}")
@@ -861,3 +1140,61 @@ async def scrape_projects_by_ids(
             status_code=500,
             detail=f"Project search failed: {type(exc).__name__}. Please try again or contact support."
         )
+
+def _sse(event: dict) -> str:
+    return f"data: {json.dumps(event, default=str)}\n\n"
+
+@router.post("/scrape-project/stream")
+async def stream_projects_by_ids(
+    req: ProjectScrapeRequest,
+    authorization: str = Header(None)
+):
+    """Same as /scrape-project, but streams Server-Sent Events as projects are scraped, saved or fail,
+    and ends with a summary event."""
+    user_id, url, estimate_one_email, estimate_one_password = await _authorize_project_scrape(req, authorization)
+    progress: asyncio.Queue = asyncio.Queue()
+
+    async def run_scrape() -> dict:
+        try:
+            return await _scrape_projects_by_ids(
+                req.project_ids,
+                url,
+                estimate_one_email,
+                estimate_one_password,
+                progress=progress
+            )
+        finally:
+            progress.put_nowait(None)
+
+    async def event_gen():
+        yield _sse({"type": "started", "total": len(req.project_ids)})
+        task = asyncio.create_task(run_scrape())
+        try:
+            while (event := await progress.get()) is not None:
+                yield _sse(event)
+            results = await task
+            status, message, response_data = _summarize_project_scrape(req.project_ids, results)
+            yield _sse({"type": "summary", "status": status, "message": message, "data": response_data})
+        except EstimateOneError as exc:
+            if isinstance(exc, EstimateOneLoginError):
+                _CREDENTIALS.pop(user_id, None)
+            logger.warning(f"Project scraping failed: {exc}")
+            yield _sse({"type": "error", "status_code": exc.status_code, "detail": exc.detail})
+        except Exception as exc:
+            logger.error(f"Project scraping failed: {exc}")
+            logger.debug(f"Traceback: {traceback.format_exc()}")
+            yield _sse({
+                "type": "error",
+                "status_code": 500,
+                "detail": f"Project search failed: {type(exc).__name__}. Please try again or contact support."
+            })
+        finally:
+            # The client went away mid-stream; stop scraping on its behalf.
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        event_gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
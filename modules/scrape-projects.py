@@ -1,40 +1,48 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import traceback
 import re
-import os
+import json
 import time
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import List, Dict, Any, Tuple
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel
-from playwright.sync_api import sync_playwright, Page
-from dotenv import load_dotenv
-from cryptography.fernet import Fernet
-from supabase import create_client, Client
-from supabase.client import ClientOptions
-
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
-
-supabase: Client = create_client(
-    SUPABASE_URL,
-    SUPABASE_KEY,
-    options=ClientOptions(
-        postgrest_client_timeout=10,
-        storage_client_timeout=10,
-    ),
+from playwright.async_api import Page
+from modules.supabase_client import async_supabase, get_user_id
+from modules.browser_pool import browser_pool
+# Credentials, the saved-login directory and the login error are shared with estimate.py,
+# so both scrapers reuse one decrypted login and one saved session per account.
+from modules.estimate import (
+    STORAGE_STATE_DIR,
+    EstimateOneLoginError,
+    _CREDENTIALS,
+    get_estimate_one_credentials,
+    is_missing_conflict_target,
+    owned_state_dir,
+    write_private_file,
 )
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
 logger = logging.getLogger("EstimateOneProjectSearch")
 router = APIRouter()
-thread_pool = ThreadPoolExecutor(max_workers=3)
+# Searches are I/O-bound, so each job runs on the event loop with async Playwright: it
+# checks contexts out of the shared browser_pool, logs in once, and runs up to
+# SEARCH_WORKERS contexts sharing its cookies.
+MAX_CONCURRENT_SCRAPES = 3
+SEARCH_WORKERS = 6
+scrape_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SCRAPES)
+PROGRESS_LOG_EVERY = 25
+EXISTS_CHUNK_SIZE = 500
+INSERT_RETRY_CHUNK_SIZE = 50
+MAX_PROJECT_IDS = 500
+
+_TRADES_RE = re.compile(r'(\d+)\s+trades')
+_DEADLINE_RE = re.compile(r'submitted by\s+(.+?)\.')
 
 class ProjectSearchRequest(BaseModel):
     project_ids: List[str]  # Always use list, even for single ID
@@ -45,36 +53,75 @@ class ProjectSearchResponse(BaseModel):
     message: str
     data: dict
 
-def decrypt_password(encrypted_password: str) -> str:
-    ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
-    if not ENCRYPTION_KEY:
-        raise ValueError("ENCRYPTION_KEY not found in environment variables")
-    cipher_suite = Fernet(ENCRYPTION_KEY.encode())
-    decrypted_password = cipher_suite.decrypt(encrypted_password.encode())
-    return decrypted_password.decode()
-
 class EstimateOneProjectSearchScraper:
-    def __init__(self, email=None, password=None):
+    # True once every "Read more" link in the section has expanded.
+    EXPANDED_JS = "section => !Array.from(section.querySelectorAll('a'), a => a.innerText).some(t => t.includes('Read more'))"
+    # Reads every popup field in one evaluate instead of a query_selector/inner_text pair per field.
+    POPUP_JS = """section => {
+        const text = el => el ? el.innerText.trim() : null;
+        const address = [".styles__projectAddress__e13a9deabdbf43356939", "[class*='address']", "[class*='location']"]
+            .map(s => section.querySelector(s)).find(Boolean);
+        return {
+            text: section.innerText,
+            name: text(section.querySelector("h1, h2, h3, .project-title, [class*='title']")),
+            address: text(address),
+            budget: text(section.querySelector(".styles__budgetRange__b101ae22d71fd54397d0")),
+            descriptions: Array.from(section.querySelectorAll(".styles__stageDescription__a6f572d1edbede52b379"), item => ({
+                builder: text(item.querySelector("strong")),
+                text: item.innerText.trim(),
+            })),
+        };
+    }"""
+
+    def __init__(self, email=None, password=None, strict_blocking=True):
         self.email = email
         self.password = password
         self.login_url = "https://app.estimateone.com/auth/login"
+        # First-party allowlist, as in estimate.py: once logged in, nothing but EstimateOne is needed.
+        self.strict_blocking = strict_blocking
+        # Contexts currently logging in, which let third-party requests through.
+        self._relaxed_contexts: set = set()
         self.session_cache = {}
         self.session_duration = 1800
         logger.info(f"Loading EstimateOne credentials - Email: {'✓' if self.email else '✗'}, Password: {'✓' if self.password else '✗'}")
         if not self.email or not self.password:
             raise ValueError("Missing EstimateOne email and password")
 
-    def block_resources_aggressive(self, route, request):
-        blocked_types = ["image", "stylesheet", "font", "media", "websocket", "manifest"]
-        blocked_domains = ["google-analytics", "facebook.com", "twitter.com", "linkedin.com", "doubleclick.net"]
-        if request.resource_type in blocked_types:
-            route.abort()
-        elif any(domain in request.url for domain in blocked_domains):
-            route.abort()
+    @property
+    def storage_state_path(self) -> Path:
+        account = hashlib.sha256(self.email.encode()).hexdigest()[:16]
+        return STORAGE_STATE_DIR / f"estimateone_state_{account}.json"
+
+    def get_cached_session(self) -> str | None:
+        """Saved login state for this account, if it is younger than session_duration."""
+        if owned_state_dir() is None:
+            return None
+        path = self.storage_state_path
+        try:
+            if time.time() - path.stat().st_mtime < self.session_duration:
+                return str(path)
+        except FileNotFoundError:
+            pass
+        return None
+
+    async def cache_session(self, context):
+        # Session cookies: same owner-only directory and 0600 atomic write as estimate.py.
+        if owned_state_dir() is None:
+            return
+        try:
+            state = await context.storage_state()
+            write_private_file(self.storage_state_path, json.dumps(state))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save login state: {e}")
+
+    async def block_resources_aggressive(self, route, request, context):
+        # browser_pool routes only third-party URLs here; assets and trackers are aborted without a Python callback.
+        if self.strict_blocking and context not in self._relaxed_contexts:
+            await route.abort()
         else:
-            route.continue_()
+            await route.continue_()
 
-    def is_logged_in_ultra_fast(self, page: Page) -> bool:
+    async def is_logged_in_ultra_fast(self, page: Page) -> bool:
         try:
             current_url = page.url
             logger.info(f"Checking login status on URL: {current_url}")
@@ -86,31 +133,39 @@ class EstimateOneProjectSearchScraper:
                 ".styles__projectLink__bb24735487bba39065d8",
                 'input[placeholder*="Search by project name"]'
             ]
-            for indicator in login_indicators:
-                if page.query_selector(indicator):
-                    logger.info(f"Fast login verified - found {indicator}")
-                    return True
+            if await page.query_selector(", ".join(login_indicators)):
+                logger.info("Fast login verified - found logged-in element")
+                return True
             return False
         except Exception as e:
             logger.error(f"Ultra-fast login check error: {e}")
             return False
 
-    def login_to_estimate_one_fast(self, page: Page) -> bool:
+    async def login_to_estimate_one_fast(self, page: Page) -> bool:
+        # The login form may depend on third-party scripts, so relax the allowlist while it runs,
+        # for this page's context only: other workers keep blocking.
+        self._relaxed_contexts.add(page.context)
+        try:
+            return await self._login_to_estimate_one(page)
+        finally:
+            self._relaxed_contexts.discard(page.context)
+
+    async def _login_to_estimate_one(self, page: Page) -> bool:
         try:
             logger.info("🔑 Starting fast login attempt...")
-            logger.info(f"🔑 Using email: {self.email}")
+            logger.info("🔑 Using account: %s", hashlib.sha256(self.email.encode()).hexdigest()[:8])
             logger.info("📍 Navigating to login page...")
-            page.goto(self.login_url, timeout=10000, wait_until="commit")
+            await page.goto(self.login_url, timeout=10000, wait_until="commit")
             logger.info("⏳ Waiting for login form...")
-            page.wait_for_selector("#user_log_in_email", timeout=8000)
+            await page.wait_for_selector("#user_log_in_email", timeout=8000)
             logger.info("📝 Filling login form...")
-            page.fill("#user_log_in_email", self.email)
-            page.fill("#user_log_in_plainPassword", self.password)
+            await page.fill("#user_log_in_email", self.email)
+            await page.fill("#user_log_in_plainPassword", self.password)
             logger.info("🚀 Clicking login button...")
-            page.click("button.btn.btn-block.btn-lg.btn-primary")
+            await page.click("button.btn.btn-block.btn-lg.btn-primary")
             logger.info("⏳ Waiting for login success...")
             try:
-                page.wait_for_function(
+                await page.wait_for_function(
                     "() => !window.location.href.includes('/auth/login')",
                     timeout=20000
                 )
@@ -119,7 +174,7 @@ class EstimateOneProjectSearchScraper:
             except Exception as e1:
                 logger.warning(f"URL change method failed: {e1}")
                 try:
-                    page.wait_for_selector("tbody.styles__tenderRow__b2e48989c7e9117bd552", timeout=10000)
+                    await page.wait_for_selector("tbody.styles__tenderRow__b2e48989c7e9117bd552", timeout=10000)
                     logger.info("✅ Login successful - found project rows")
                     return True
                 except Exception as e2:
@@ -135,34 +190,20 @@ class EstimateOneProjectSearchScraper:
             logger.error(f"❌ Login error: {e}")
             return False
 
-    def check_project_exists_supabase(self, project_id: str) -> bool:
-        """Returns True if project ID exists in Supabase, else False."""
+    async def search_project_by_id(self, page: Page, project_id: str) -> bool:
         try:
-            if not project_id:
-                return False
-            result = supabase.table("tenders").select("project_id").eq("project_id", project_id).execute()
-            exists = bool(result.data)
-            if exists:
-                logger.info(f"⚠️ Project {project_id} exists in Supabase, skipping.")
-            return exists
-        except Exception as e:
-            logger.error(f"❌ Error checking project in Supabase for {project_id}: {e}")
-            return False
-
-    def search_project_by_id(self, page: Page, project_id: str) -> bool:
-        try:
-            logger.info(f"🔍 Searching for project ID: {project_id}")
+            logger.debug("🔍 Searching for project ID: %s", project_id)
             search_input_selector = 'input[placeholder*="Search by project name, project id, address, brand or product"]'
-            page.wait_for_selector(search_input_selector, timeout=5000)
-            page.click(search_input_selector)
-            page.fill(search_input_selector, "")
-            page.fill(search_input_selector, project_id)
-            logger.info("⏳ Waiting for search results...")
-            page.wait_for_selector('.styles__autocomplete__d2da89763ad53db5dcf7', timeout=5000)
-            suggested_project = page.query_selector('.styles__suggestedProject__f400d5576aec8e4ea183 a')
+            await page.wait_for_selector(search_input_selector, timeout=5000)
+            await page.click(search_input_selector)
+            await page.fill(search_input_selector, "")
+            await page.fill(search_input_selector, project_id)
+            logger.debug("⏳ Waiting for search results...")
+            await page.wait_for_selector('.styles__autocomplete__d2da89763ad53db5dcf7', timeout=5000)
+            suggested_project = await page.query_selector('.styles__suggestedProject__f400d5576aec8e4ea183 a')
             if suggested_project:
-                logger.info(f"✅ Found project {project_id} in autocomplete")
-                suggested_project.click()
+                logger.debug("✅ Found project %s in autocomplete", project_id)
+                await suggested_project.click()
                 return True
             else:
                 logger.warning(f"❌ Project {project_id} not found in autocomplete")
@@ -171,77 +212,70 @@ class EstimateOneProjectSearchScraper:
             logger.error(f"❌ Error searching for project {project_id}: {e}")
             return False
 
-    def expand_read_more_in_popup(self, details_section, page):
+    async def expand_read_more_in_popup(self, details_section, page):
         """Patch: expand all builder descriptions if global read more button is present."""
         try:
-            read_btn = details_section.query_selector("a.styles__hideShow__e8f2d705067479d13623")
-            if read_btn:
-                read_btn.scroll_into_view_if_needed()
-                page.evaluate("el => el.click()", read_btn)
-                time.sleep(1.2)
-                logger.info("Clicked global Read more for builder descriptions")
+            # Find and click in one evaluate rather than a handle lookup, a scroll and a click.
+            clicked = await details_section.evaluate(
+                "(section, sel) => { const btn = section.querySelector(sel); btn?.click(); return !!btn; }",
+                "a.styles__hideShow__e8f2d705067479d13623"
+            )
+            if clicked:
+                logger.debug("Clicked global Read more for builder descriptions")
+                # Returns as soon as no "Read more" link is left, instead of a fixed 1.2 s sleep.
+                await page.wait_for_function(self.EXPANDED_JS, arg=details_section, timeout=1500)
         except Exception as e:
             logger.debug(f"Error clicking 'Read more': {e}")
 
-    def extract_project_details_fast(self, page: Page) -> Dict[str, Any]:
+    async def extract_project_details_fast(self, page: Page) -> Dict[str, Any]:
         details = {}
         try:
             detail_selectors = [
                 "#project-details",
                 ".styles__projectSection__f1b9aeb71ec0b48e56e0",
-                ".ReactModal__Content"
+                ".ReactModal__Content",
+                "[role='dialog']"
             ]
-            details_section = None
-            for selector in detail_selectors:
-                try:
-                    page.wait_for_selector(selector, timeout=800)
-                    details_section = page.query_selector(selector)
-                    if details_section:
-                        break
-                except:
-                    continue
-            if not details_section:
-                details_section = page.query_selector(".ReactModal__Content, [role='dialog']")
+            # One wait that resolves on whichever container shows up first...
+            try:
+                await page.wait_for_selector(", ".join(detail_selectors), timeout=1500)
+            except:
+                return details
+            # ...then take the most specific one present, in a single round trip.
+            section_handle = await page.evaluate_handle(
+                "selectors => selectors.map(s => document.querySelector(s)).find(Boolean) || null",
+                detail_selectors
+            )
+            details_section = section_handle.as_element()
             if not details_section:
                 return details
 
             # --- PATCH: expand all builder descriptions before scraping ---
-            self.expand_read_more_in_popup(details_section, page)
+            await self.expand_read_more_in_popup(details_section, page)
 
-            all_text = details_section.inner_text()
-            trades_match = re.search(r'(\d+)\s+trades', all_text)
+            popup = await details_section.evaluate(self.POPUP_JS)
+            all_text = popup["text"]
+            trades_match = _TRADES_RE.search(all_text)
             if trades_match:
                 details["Number of Trades"] = trades_match.group(1)
-            deadline_match = re.search(r'submitted by\s+(.+?)\.', all_text)
+            deadline_match = _DEADLINE_RE.search(all_text)
             if deadline_match:
                 details["Submission Deadline"] = deadline_match.group(1).strip()
-            overall_budget_elem = details_section.query_selector(".styles__budgetRange__b101ae22d71fd54397d0")
-            if overall_budget_elem:
-                details["Overall Budget"] = overall_budget_elem.inner_text().strip()
-            project_name_elem = details_section.query_selector("h1, h2, h3, .project-title, [class*='title']")
-            if project_name_elem:
-                details["Project Name"] = project_name_elem.inner_text().strip()
-            address_selectors = [".styles__projectAddress__e13a9deabdbf43356939", "[class*='address']", "[class*='location']"]
-            for selector in address_selectors:
-                address_elem = details_section.query_selector(selector)
-                if address_elem:
-                    details["Project Address"] = address_elem.inner_text().strip()
-                    break
+            if popup["budget"] is not None:
+                details["Overall Budget"] = popup["budget"]
+            if popup["name"] is not None:
+                details["Project Name"] = popup["name"]
+            if popup["address"] is not None:
+                details["Project Address"] = popup["address"]
             # Builder descriptions
             builder_descriptions = []
-            description_items = details_section.query_selector_all(".styles__stageDescription__a6f572d1edbede52b379")
-            for item in description_items:
+            for item in popup["descriptions"]:
                 description_data = {}
-                builder_name_elem = item.query_selector("strong")
-                if builder_name_elem:
-                    builder_text = builder_name_elem.inner_text().strip()
-                    builder_name = builder_text.replace(" says:", "").strip()
-                    description_data["builder_name"] = builder_name
-                full_description = item.inner_text().strip()
+                if item["builder"] is not None:
+                    description_data["builder_name"] = item["builder"].replace(" says:", "").strip()
                 # Optionally: parse builder_budget as in previous logic if needed
-                description_data["description"] = full_description
-                if description_data:
-                    builder_descriptions.append(description_data)
+                description_data["description"] = item["text"]
+                builder_descriptions.append(description_data)
             if builder_descriptions:
                 details["Builder Descriptions"] = builder_descriptions
             return details
@@ -249,126 +283,218 @@ class EstimateOneProjectSearchScraper:
             logger.warning(f"Fast extraction error (continuing): {e}")
             return details
 
-    def close_popup_fast(self, page: Page):
+    async def close_popup_fast(self, page: Page):
         try:
-            page.keyboard.press("Escape")
+            await page.keyboard.press("Escape")
             try:
-                page.wait_for_selector(".ReactModal__Overlay--after-open", state="hidden", timeout=300)
+                await page.wait_for_selector(".ReactModal__Overlay--after-open", state="hidden", timeout=1500)
                 return "success"
             except:
-                page.keyboard.press("Escape")
+                await page.keyboard.press("Escape")
                 return "success"
         except Exception as e:
             logger.warning(f"Popup close error (continuing): {e}")
             return "success"
 
-    def insert_to_supabase(self, project_data: Dict[str, Any]) -> bool:
+    def _to_tender_row(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "url": project_data.get("source_url", ""),
+            "scraped_at": project_data.get("scraped_at") or datetime.now(timezone.utc).isoformat(),
+            "project_name": project_data.get("Project Name"),
+            "project_id": project_data.get("Project ID"),
+            "project_address": project_data.get("Project Address"),
+            "max_budget": project_data.get("Max Budget"),
+            "distance": project_data.get("Distance"),
+            "category": project_data.get("Category"),
+            "builder": project_data.get("Builder"),
+            "quote_due_builder": project_data.get("Quote Due (Builder)"),
+            "project_due_date": project_data.get("Project Due Date"),
+            "has_documents": project_data.get("Has Documents") == "Yes",
+            "interest_level": project_data.get("Interest Level"),
+            "number_of_trades": int(project_data.get("Number of Trades", 0)) if project_data.get("Number of Trades") else None,
+            "submission_deadline": project_data.get("Submission Deadline"),
+            "overall_budget": project_data.get("Overall Budget"),
+            "builder_descriptions": project_data.get("Builder Descriptions"),
+        }
+
+    async def _upsert_tenders(self, projects: List[Dict[str, Any]]) -> bool:
+        rows = [self._to_tender_row(project_data) for project_data in projects]
+        # Relies on the unique index from migrations/001_tenders_project_id_url_unique.sql
+        # so retries overwrite instead of duplicating.
+        result = await async_supabase.table("tenders").upsert(rows, on_conflict="project_id,url").execute()
+        return bool(result.data)
+
+    async def insert_to_supabase(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Upsert all scraped projects in one request; returns the projects that were saved."""
+        if not projects:
+            return []
         try:
-            supabase_data = {
-                "url": project_data.get("source_url", ""),
-                "scraped_at": datetime.utcnow().isoformat(),
-                "project_name": project_data.get("Project Name"),
-                "project_id": project_data.get("Project ID"),
-                "project_address": project_data.get("Project Address"),
-                "max_budget": project_data.get("Max Budget"),
-                "distance": project_data.get("Distance"),
-                "category": project_data.get("Category"),
-                "builder": project_data.get("Builder"),
-                "quote_due_builder": project_data.get("Quote Due (Builder)"),
-                "project_due_date": project_data.get("Project Due Date"),
-                "has_documents": project_data.get("Has Documents") == "Yes",
-                "interest_level": project_data.get("Interest Level"),
-                "number_of_trades": int(project_data.get("Number of Trades", 0)) if project_data.get("Number of Trades") else None,
-                "submission_deadline": project_data.get("Submission Deadline"),
-                "overall_budget": project_data.get("Overall Budget"),
-                "builder_descriptions": project_data.get("Builder Descriptions"),
-            }
-            supabase_data = {k: v for k, v in supabase_data.items() if v is not None}
-            result = supabase.table("tenders").insert(supabase_data).execute()
-            if result.data:
-                logger.info(f"✅ Inserted project '{project_data.get('Project Name', 'Unknown')}' to Supabase")
-                return True
-            else:
-                logger.error(f"❌ Failed to insert project to Supabase: {result}")
-                return False
+            if await self._upsert_tenders(projects):
+                logger.info("✅ Inserted %d project(s) to Supabase", len(projects))
+                return projects
+            logger.error(f"❌ Failed to insert {len(projects)} project(s) to Supabase - no data returned")
         except Exception as e:
-            logger.error(f"❌ Supabase insertion error: {e}")
-            return False
+            if is_missing_conflict_target(e):
+                return []
+            logger.error(f"❌ Supabase insertion error for {len(projects)} project(s): {e}")
+        # One bad row fails the whole request, so retry in chunks to save the rest.
+        saved = []
+        for start in range(0, len(projects), INSERT_RETRY_CHUNK_SIZE):
+            chunk = projects[start:start + INSERT_RETRY_CHUNK_SIZE]
+            try:
+                if await self._upsert_tenders(chunk):
+                    saved.extend(chunk)
+            except Exception as e:
+                logger.error(f"❌ Supabase insertion error for chunk at {start}: {e}")
+        logger.info("Inserted %d/%d project(s) after retrying in chunks", len(saved), len(projects))
+        return saved
+
+async def fetch_existing_project_ids(project_ids: List[str]) -> set[str]:
+    """Project IDs already in Supabase, looked up with one in_() query per chunk."""
+    existing = set()
+    ids = [project_id for project_id in dict.fromkeys(project_ids) if project_id]
+    try:
+        # Chunked to keep the in.(...) filter well under PostgREST's URL length limit.
+        for start in range(0, len(ids), EXISTS_CHUNK_SIZE):
+            chunk = ids[start:start + EXISTS_CHUNK_SIZE]
+            result = await async_supabase.table("tenders").select("project_id").in_("project_id", chunk).execute()
+            existing.update(row["project_id"] for row in result.data)
+    except Exception as e:
+        logger.error(f"❌ Error checking projects in Supabase: {e}")
+    return existing
+
+async def _search_worker(
+    scraper: EstimateOneProjectSearchScraper,
+    page: Page,
+    queue: asyncio.Queue,
+    url: str,
+    scraped_at: str,
+    results: dict,
+    scraped: List[Dict[str, Any]],
+    errors: List[Tuple[str, str]],
+    total: int
+):
+    """Search queued project IDs one at a time on this worker's page until the queue is empty.
+
+    Scraped projects are collected in ``scraped`` and saved in one batch once every worker is done.
+    """
+    while not queue.empty():
+        project_id = queue.get_nowait()
+        try:
+            logger.debug("🔄 Processing project ID %s", project_id)
+            if not await scraper.search_project_by_id(page, project_id):
+                results["failed"] += 1
+                results["details"].append(f"Project {project_id}: Not found in search")
+                continue
+            try:
+                await page.wait_for_selector(".ReactModal__Content, [role='dialog'], #project-details", timeout=3000)
+            except:
+                logger.warning(f"⚠️ Popup may not have opened for project {project_id}")
+            project_data = await scraper.extract_project_details_fast(page)
+            project_data["Project ID"] = project_id
+            project_data["source_url"] = url
+            project_data["scraped_at"] = scraped_at
+            scraped.append(project_data)
+            logger.debug("✅ Scraped project %s", project_id)
+            # close_popup_fast waits for the overlay to go; search_project_by_id then waits for the input.
+            await scraper.close_popup_fast(page)
+        except Exception as e:
+            results["failed"] += 1
+            results["details"].append(f"Project {project_id}: {str(e)}")
+            errors.append((project_id, repr(e)))
+            try:
+                await scraper.close_popup_fast(page)
+            except:
+                pass
+        finally:
+            done = len(scraped) + results["failed"]
+            if done % PROGRESS_LOG_EVERY == 0:
+                logger.info("Searched %d/%d projects (%d scraped, %d failed)", done, total, len(scraped), results["failed"])
+
+async def _new_search_page(scraper: EstimateOneProjectSearchScraper, contexts: list, storage_state=None) -> Page:
+    context = await browser_pool.checkout(scraper, storage_state=storage_state)
+    contexts.append(context)
+    return await browser_pool.new_page(context)
 
-def _process_projects_by_ids_sync(
+async def _extra_search_worker(scraper: EstimateOneProjectSearchScraper, contexts: list, storage_state, url: str, *worker_args):
+    try:
+        page = await _new_search_page(scraper, contexts, storage_state)
+        await page.goto(url, wait_until="commit")
+    except Exception as e:
+        # Whatever this worker would have searched is picked up by the others.
+        logger.warning(f"⚠️ Search worker failed to start: {e}")
+        return
+    await _search_worker(scraper, page, *worker_args)
+
+async def _process_projects_by_ids(
     project_ids: List[str],
+    existing: set[str],
     url: str,
     estimate_one_email: str,
     estimate_one_password: str
 ) -> dict:
-    """Process multiple project IDs, expanding 'read more', skipping already present projects."""
+    """Process multiple project IDs, expanding 'read more', skipping the already present ``existing`` projects."""
     results = {"processed": 0, "failed": 0, "details": [], "sample_project": {}}
     scraper = EstimateOneProjectSearchScraper(email=estimate_one_email, password=estimate_one_password)
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-gpu',
-                '--disable-extensions',
-                '--disable-plugins'
-            ]
+    new_project_ids = []
+    for project_id in dict.fromkeys(project_ids):
+        if project_id in existing:
+            results["details"].append(f"Project {project_id}: SKIPPED (already exists in database)")
+        else:
+            new_project_ids.append(project_id)
+    project_ids = new_project_ids
+    if not project_ids:
+        # Everything is already saved (typically a retry); no need to open a browser context.
+        return results
+    contexts = []
+    try:
+        # browser_pool starts the first context from a login saved within session_duration,
+        # so the page can go straight to the tenders list.
+        page = await _new_search_page(scraper, contexts)
+        logger.info("🌐 Opening EstimateOne URL: %s", url)
+        await page.goto(url, wait_until="commit")
+        if not await scraper.is_logged_in_ultra_fast(page):
+            if not await scraper.login_to_estimate_one_fast(page):
+                raise EstimateOneLoginError("Login failed")
+            await scraper.cache_session(page.context)
+            await page.goto(url, wait_until="commit")
+        total = len(project_ids)
+        # One timestamp per job: every row of the batch shares the same string.
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        errors: List[Tuple[str, str]] = []
+        scraped: List[Dict[str, Any]] = []
+        queue: asyncio.Queue = asyncio.Queue()
+        for project_id in project_ids:
+            queue.put_nowait(project_id)
+        # The other workers get their own contexts, logged in with this page's cookies. They
+        # start up concurrently while this page is already searching.
+        extra_workers = min(SEARCH_WORKERS, total) - 1
+        storage_state = await page.context.storage_state() if extra_workers else None
+        worker_args = (queue, url, scraped_at, results, scraped, errors, total)
+        await asyncio.gather(
+            _search_worker(scraper, page, *worker_args),
+            *(_extra_search_worker(scraper, contexts, storage_state, url, *worker_args) for _ in range(extra_workers)),
         )
-        context = browser.new_context()
-        context.route("**/*", scraper.block_resources_aggressive)
-        page = context.new_page()
-        try:
-            logger.info("🌐 Opening EstimateOne URL: %s", url)
-            page.goto(url, wait_until="commit")
-            if not scraper.is_logged_in_ultra_fast(page):
-                if not scraper.login_to_estimate_one_fast(page):
-                    raise RuntimeError("❌ Login failed")
-                page.goto(url, wait_until="commit")
-            for i, project_id in enumerate(project_ids, 1):
-                if scraper.check_project_exists_supabase(project_id):
-                    results["details"].append(f"Project {project_id}: SKIPPED (already exists in database)")
-                    continue
-                try:
-                    logger.info(f"🔄 Processing project {i}/{len(project_ids)}: ID {project_id}")
-                    if not scraper.search_project_by_id(page, project_id):
-                        results["failed"] += 1
-                        results["details"].append(f"Project {project_id}: Not found in search")
-                        continue
-                    try:
-                        page.wait_for_selector(".ReactModal__Content, [role='dialog'], #project-details", timeout=3000)
-                    except:
-                        logger.warning(f"⚠️ Popup may not have opened for project {project_id}")
-                    project_data = scraper.extract_project_details_fast(page)
-                    project_data["Project ID"] = project_id
-                    project_data["source_url"] = url
-                    project_data["scraped_at"] = datetime.now().isoformat()
-                    if scraper.insert_to_supabase(project_data):
-                        results["processed"] += 1
-                        if not results["sample_project"]:
-                            results["sample_project"] = {
-                                "project_name": project_data.get("Project Name"),
-                                "project_id": project_data.get("Project ID"),
-                                "overall_budget": project_data.get("Overall Budget"),
-                                "number_of_trades": project_data.get("Number of Trades")
-                            }
-                        logger.info(f"✅ Successfully processed project {project_id}")
-                    else:
-                        results["failed"] += 1
-                        results["details"].append(f"Project {project_id}: Database insertion failed")
-                    scraper.close_popup_fast(page)
-                    time.sleep(0.5)
-                except Exception as e:
-                    results["failed"] += 1
-                    results["details"].append(f"Project {project_id}: {str(e)}")
-                    logger.error(f"❌ Error processing project {project_id}: {e}")
-                    try:
-                        scraper.close_popup_fast(page)
-                    except:
-                        pass
-        finally:
-            context.close()
-            browser.close()
+        saved = await scraper.insert_to_supabase(scraped)
+        saved_ids = {project_data["Project ID"] for project_data in saved}
+        results["processed"] += len(saved)
+        for project_data in scraped:
+            if project_data["Project ID"] not in saved_ids:
+                results["failed"] += 1
+                results["details"].append(f"Project {project_data['Project ID']}: Database insertion failed")
+        if saved:
+            results["sample_project"] = {
+                "project_name": saved[0].get("Project Name"),
+                "project_id": saved[0].get("Project ID"),
+                "overall_budget": saved[0].get("Overall Budget"),
+                "number_of_trades": saved[0].get("Number of Trades")
+            }
+        logger.info("Processed %d/%d projects (%d saved, %d failed)", total, total, results["processed"], results["failed"])
+        if errors:
+            logger.error("❌ Errors processing %d project(s): %s", len(errors), errors)
+    finally:
+        for context in contexts:
+            await browser_pool.checkin(context)
     return results
 
 @router.post("/scrape-projects", response_model=ProjectSearchResponse)
@@ -378,6 +504,10 @@ async def scrape_projects_by_ids(
 ):
     if not req.project_ids:
         raise HTTPException(400, "No project IDs provided")
+    # Repeated IDs would be searched twice; drop them (keeping order) before any I/O.
+    req.project_ids = list(dict.fromkeys(req.project_ids))
+    if len(req.project_ids) > MAX_PROJECT_IDS:
+        raise HTTPException(413, f"Too many project IDs ({len(req.project_ids)} > {MAX_PROJECT_IDS})")
     url = req.url.strip()
     if not url.startswith(("http://", "https://")):
         raise HTTPException(400, "Invalid URL format")
@@ -387,30 +517,18 @@ async def scrape_projects_by_ids(
         raise HTTPException(status_code=401, detail="Authentication required. Please login first.")
     token = authorization.split(" ")[1]
     try:
-        user = await asyncio.to_thread(lambda: supabase.auth.get_user(token))
-        if not user.user:
+        user_id = await get_user_id(token)
+        if not user_id:
             raise HTTPException(status_code=401, detail="Authentication token expired. Please login again.")
-        user_id = user.user.id
         logger.info(f"🔐 Project search request from user: {user_id}")
     except Exception as e:
         raise HTTPException(status_code=401, detail="Authentication failed. Please login again.")
     try:
-        logger.info(f"📋 Fetching credentials for user: {user_id}")
-        result = await asyncio.to_thread(
-            lambda: supabase.table("user_credentials")
-            .select("email, password_encrypted")
-            .eq("user_id", user_id)
-            .eq("credential_type", "estimate_one")
-            .execute()
+        # Independent lookups, so they run concurrently instead of back to back.
+        (estimate_one_email, estimate_one_password), existing = await asyncio.gather(
+            get_estimate_one_credentials(user_id),
+            fetch_existing_project_ids(req.project_ids),
         )
-        if not result.data:
-            raise HTTPException(
-                status_code=404,
-                detail="EstimateOne credentials not found. Please login again to store them."
-            )
-        credential_data = result.data[0]
-        estimate_one_email = credential_data["email"]
-        estimate_one_password = decrypt_password(credential_data["password_encrypted"])
     except HTTPException:
         raise
     except Exception as e:
@@ -419,17 +537,32 @@ async def scrape_projects_by_ids(
             status_code=500,
             detail="Database connection failed. Please try again later."
         )
+    if all(project_id in existing for project_id in req.project_ids):
+        # Nothing new to scrape (typically a retry): answer without waiting for a scrape slot.
+        return ProjectSearchResponse(
+            status="success",
+            message=f"All {len(req.project_ids)} projects already exist in the database.",
+            data={
+                "total_requested": len(req.project_ids),
+                "processed": 0,
+                "failed": 0,
+                "success_rate": "0.0%",
+                "sample_project": {},
+                "error_details": [f"Project {project_id}: SKIPPED (already exists in database)" for project_id in req.project_ids],
+                "scraped_at": datetime.now(timezone.utc).isoformat(),
+                "source": "EstimateOne Project Search"
+            }
+        )
     logger.info(f"=== PROJECT SEARCH REQUEST === {len(req.project_ids)} project IDs")
     try:
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            thread_pool,
-            _process_projects_by_ids_sync,
-            req.project_ids,
-            url,
-            estimate_one_email,
-            estimate_one_password
-        )
+        async with scrape_semaphore:
+            results = await _process_projects_by_ids(
+                req.project_ids,
+                existing,
+                url,
+                estimate_one_email,
+                estimate_one_password
+            )
         total_projects = len(req.project_ids)
         processed_count = results["processed"]
         failed_count = results["failed"]
@@ -452,10 +585,15 @@ async def scrape_projects_by_ids(
                 "success_rate": f"{(processed_count/total_projects)*100:.1f}%",
                 "sample_project": results.get("sample_project", {}),
                 "error_details": results.get("details", []),
-                "scraped_at": datetime.utcnow().isoformat(),
+                "scraped_at": datetime.now(timezone.utc).isoformat(),
                 "source": "EstimateOne Project Search"
             }
         )
+    except EstimateOneLoginError as exc:
+        # Rejected credentials: drop the cached copy so the next request re-reads them.
+        _CREDENTIALS.pop(user_id, None)
+        logger.warning("❌ Project search failed: %s", exc)
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
     except Exception as exc:
         logger.error("❌ Project search failed: %s\n%s", exc, traceback.format_exc())
         raise HTTPException(
@@ -3,16 +3,13 @@ from pydantic import BaseModel
 from typing import Optional
 import os
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from supabase.client import ClientOptions
-import asyncio
 from cryptography.fernet import Fernet
+import hashlib
 import logging
+from modules.supabase_client import async_supabase, evict_user, get_user, get_user_id
 
 load_dotenv()
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")
 
 # Setup logging
@@ -26,15 +23,6 @@ if not ENCRYPTION_KEY:
     print("Add this to your .env file as ENCRYPTION_KEY")
     ENCRYPTION_KEY = key.decode()
 
-supabase: Client = create_client(
-    SUPABASE_URL,
-    SUPABASE_KEY,
-    options=ClientOptions(
-        postgrest_client_timeout=10,
-        storage_client_timeout=10,
-    ),
-)
-
 router = APIRouter()
 
 class UserLogin(BaseModel):
@@ -45,25 +33,25 @@ class UserSignup(BaseModel):
     email: str
     password: str
 
+# Built once: Fernet validates and splits the key on construction.
+_cipher_suite = Fernet(ENCRYPTION_KEY.encode())
+
 def encrypt_password(password: str) -> str:
     """Encrypt password using Fernet"""
-    cipher_suite = Fernet(ENCRYPTION_KEY.encode())
-    encrypted_password = cipher_suite.encrypt(password.encode())
+    encrypted_password = _cipher_suite.encrypt(password.encode())
     return encrypted_password.decode()
 
 # SIGNUP endpoint - Only creates auth user, NO credentials storage
 @router.post("/signup")
 async def signup(user: UserSignup):
     try:
-        logger.info(f"Signup attempt for email: {user.email}")
+        logger.info("Signup attempt for account: %s", hashlib.sha256(user.email.encode()).hexdigest()[:8])
         
         # Only create user in Supabase Auth - NO credential storage
-        response = await asyncio.to_thread(
-            lambda: supabase.auth.sign_up({
-                "email": user.email,
-                "password": user.password
-            })
-        )
+        response = await async_supabase.auth.sign_up({
+            "email": user.email,
+            "password": user.password
+        })
 
         if not response.user:
             logger.error("Signup failed - user already exists or invalid data")
@@ -91,19 +79,17 @@ async def signup(user: UserSignup):
 @router.post("/login")
 async def login(user: UserLogin):
     try:
-        logger.info(f"Login attempt for email: {user.email}")
+        logger.info("Login attempt for account: %s", hashlib.sha256(user.email.encode()).hexdigest()[:8])
         
         # Validate input
         if not user.email or not user.password:
             raise HTTPException(status_code=400, detail="Email and password are required")
         
         # First, authenticate with Supabase Auth
-        response = await asyncio.to_thread(
-            lambda: supabase.auth.sign_in_with_password({
-                "email": user.email,
-                "password": user.password
-            })
-        )
+        response = await async_supabase.auth.sign_in_with_password({
+            "email": user.email,
+            "password": user.password
+        })
 
         if not response.user or not response.session:
             logger.error("Login failed - invalid credentials")
@@ -119,8 +105,8 @@ async def login(user: UserLogin):
             logger.info(f"Checking existing credentials for user: {user_id}")
             
             # Check if credentials already exist - USE .execute() not .single()
-            existing = await asyncio.to_thread(
-                lambda: supabase.table("user_credentials")
+            existing = await (
+                async_supabase.table("user_credentials")
                 .select("id")
                 .eq("user_id", user_id)
                 .eq("credential_type", "estimate_one")
@@ -134,16 +120,14 @@ async def login(user: UserLogin):
                 logger.info(f"Storing new credentials for user: {user_id}")
                 encrypted_password = encrypt_password(user.password)
                 
-                insert_result = await asyncio.to_thread(
-                    lambda: supabase.table("user_credentials").insert({
-                        "user_id": user_id,
-                        "credential_type": "estimate_one",
-                        "email": user.email,
-                        "password_encrypted": encrypted_password
-                    }).execute()
-                )
+                insert_result = await async_supabase.table("user_credentials").insert({
+                    "user_id": user_id,
+                    "credential_type": "estimate_one",
+                    "email": user.email,
+                    "password_encrypted": encrypted_password
+                }).execute()
                 
-                logger.info(f"Credential insertion result: {insert_result.data}")
+                logger.info(f"Credential insertion result: {len(insert_result.data)} rows inserted")
                 
                 if insert_result.data:
                     credentials_stored = True
@@ -190,19 +174,19 @@ async def get_current_user(authorization: str = Header(None)):
     token = authorization.split(" ")[1]
 
     try:
-        user = await asyncio.to_thread(lambda: supabase.auth.get_user(token))
+        user = await get_user(token)
         
-        if not user.user:
+        if not user:
             raise HTTPException(status_code=401, detail="Authentication token expired or invalid")
 
-        user_id = user.user.id
+        user_id, email = user
         
         # Check credential status
         credentials_stored = False
         try:
             # Use .execute() instead of .single() for checking
-            result = await asyncio.to_thread(
-                lambda: supabase.table("user_credentials")
+            result = await (
+                async_supabase.table("user_credentials")
                 .select("id, created_at")
                 .eq("user_id", user_id)
                 .eq("credential_type", "estimate_one")
@@ -215,8 +199,8 @@ async def get_current_user(authorization: str = Header(None)):
             credentials_stored = False
 
         return {
-            "id": user.user.id,
-            "email": user.user.email,
+            "id": user_id,
+            "email": email,
             "credentials_stored": credentials_stored,
             "credential_status": "stored" if credentials_stored else "not_stored"
         }
@@ -234,10 +218,12 @@ async def logout(authorization: str = Header(None)):
         raise HTTPException(status_code=401, detail="Authorization required")
 
     token = authorization.split(" ")[1]
+    # Stop trusting the cached lookup even if the sign-out call below fails
+    evict_user(token)
 
     try:
-        # Sign out from Supabase
-        await asyncio.to_thread(lambda: supabase.auth.sign_out())
+        # Revoke this user's refresh tokens; the shared server client holds no session of its own
+        await async_supabase.auth.admin.sign_out(token)
         
         return {
             "success": True,
@@ -260,17 +246,16 @@ async def get_credentials_status(authorization: str = Header(None)):
     token = authorization.split(" ")[1]
 
     try:
-        user = await asyncio.to_thread(lambda: supabase.auth.get_user(token))
-        if not user.user:
+        user_id = await get_user_id(token)
+        if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        user_id = user.user.id
         
         logger.info(f"Checking credentials status for user: {user_id}")
 
         # Use .execute() instead of .single() to avoid PGRST116 error
-        result = await asyncio.to_thread(
-            lambda: supabase.table("user_credentials")
+        result = await (
+            async_supabase.table("user_credentials")
             .select("email, credential_type, created_at")
             .eq("user_id", user_id)
             .eq("credential_type", "estimate_one")
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import time
+import weakref
+import httpx
+import jwt
+from cachetools import TTLCache
+from dotenv import load_dotenv
+from postgrest import AsyncPostgrestClient
+from postgrest.utils import AsyncClient
+from gotrue import AsyncGoTrueClient
+
+load_dotenv()
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+# httpx drops idle connections after 5 s by default, so requests a few seconds apart
+# would each pay a fresh TLS handshake; keep them for a minute instead.
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60)
+
+class AsyncSupabase:
+    """Async auth + PostgREST clients; supabase-py 2.0.2 ships no acreate_client."""
+
+    def __init__(self, url: str, key: str):
+        headers = {"apiKey": key, "Authorization": f"Bearer {key}"}
+        # Auth and PostgREST talk to the same host, so both clients sit on one keep-alive
+        # HTTP/2 pool; retries=1 re-attempts a failed connect once before surfacing it.
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=_POOL_LIMITS, retries=1)
+        self.auth = AsyncGoTrueClient(
+            url=f"{url}/auth/v1",
+            headers=headers,
+            auto_refresh_token=False,
+            persist_session=False,
+            http_client=httpx.AsyncClient(timeout=10, transport=transport),
+        )
+        self.postgrest = AsyncPostgrestClient(f"{url}/rest/v1", headers=headers, timeout=10)
+        # Swap the default session for one on the shared pool; every table() call reuses it.
+        session = self.postgrest.session
+        self.postgrest.session = AsyncClient(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=10,
+            transport=transport,
+        )
+
+    def table(self, table_name: str):
+        return self.postgrest.from_(table_name)
+
+    async def warm_up(self):
+        """Open the PostgREST connection ahead of the first request."""
+        await self.table("tenders").select("project_id").limit(1).execute()
+
+async_supabase = AsyncSupabase(SUPABASE_URL, SUPABASE_KEY)
+
+# token -> (user_id, email, exp) for tokens resolved through the Auth API.
+_USERS: TTLCache = TTLCache(maxsize=4096, ttl=300)
+# One lock per token being resolved, so concurrent first requests make a single Auth API call.
+_USER_LOCKS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+async def get_user(token: str) -> tuple[str, str | None] | None:
+    """(user_id, email) for an access token, verified locally when SUPABASE_JWT_SECRET is set.
+
+    Local verification only checks the signature and expiry, so a token signed out before it
+    expires is still accepted until then; the cached Auth API lookup drops it via evict_user().
+    """
+    if SUPABASE_JWT_SECRET:
+        try:
+            payload = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"], audience="authenticated")
+            return payload["sub"], payload.get("email")
+        except jwt.PyJWTError:
+            pass
+    cached = _USERS.get(token)
+    if cached and cached[2] > time.time():
+        return cached[:2]
+    lock = _USER_LOCKS.get(token)
+    if lock is None:
+        lock = _USER_LOCKS[token] = asyncio.Lock()
+    async with lock:
+        cached = _USERS.get(token)
+        if cached and cached[2] > time.time():
+            return cached[:2]
+        user = await async_supabase.auth.get_user(token)
+        if not user.user:
+            return None
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp", 0)
+        _USERS[token] = (user.user.id, user.user.email, exp)
+        return user.user.id, user.user.email
+
+def evict_user(token: str) -> None:
+    """Forget a cached Auth API lookup, e.g. once the token's session has been signed out."""
+    _USERS.pop(token, None)
+
+async def get_user_id(token: str) -> str | None:
+    """User ID for an access token; see get_user."""
+    user = await get_user(token)
+    return user[0] if user else None